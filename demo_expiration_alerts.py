@@ -7,148 +7,452 @@ This script demonstrates the expiration notification system without requiring re
 import sys
 import os
 import json
-import requests
+import re
+import bisect
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = lambda b: json.loads(b.decode('utf-8'))
 
 # Load environment from local.settings.json
 local_settings_path = os.path.join(os.path.dirname(__file__), '..', 'local.settings.json')
 if os.path.exists(local_settings_path):
-    with open(local_settings_path, 'r') as f:
-        settings = json.load(f)
-        for key, value in settings.get('Values', {}).items():
-            os.environ[key] = value
+    with open(local_settings_path, 'rb') as f:
+        settings = _loads(f.read())
+    os.environ.update({key: str(value) for key, value in settings.get('Values', {}).items()})
 
-def create_mock_environments():
-    """Create realistic mock ADE environments with various expiration states."""
-    now = datetime.now(timezone.utc)
+# Python 3.11+ fromisoformat() accepts a trailing 'Z' natively
+_NEEDS_Z_REPLACE = sys.version_info < (3, 11)
+
+def create_mock_environments(now=None):
+    """
+    Create realistic mock ADE environments with various expiration states.
+    Returned column-wise (struct-of-arrays): one list per field, where index i
+    across all lists describes environment i.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
     
-    mock_envs = [
-        {
-            "name": "dev-frontend-app",
-            "projectName": "customer-portal",
-            "user": "alice@company.com",
-            "catalogName": "production-catalog",
-            "environmentType": "Development",
-            "resourceGroupId": "/subscriptions/abc123/resourceGroups/rg-dev-frontend",
-            "expirationDate": (now - timedelta(days=2)).isoformat(),  # EXPIRED 2 days ago
-            "provisioningState": "Succeeded"
-        },
-        {
-            "name": "test-backend-api",
-            "projectName": "customer-portal",
-            "user": "bob@company.com",
-            "catalogName": "production-catalog",
-            "environmentType": "Testing",
-            "resourceGroupId": "/subscriptions/abc123/resourceGroups/rg-test-backend",
-            "expirationDate": now.isoformat(),  # EXPIRES TODAY
-            "provisioningState": "Succeeded"
-        },
-        {
-            "name": "demo-ml-workspace",
-            "projectName": "ai-initiatives",
-            "user": "carol@company.com",
-            "catalogName": "ml-catalog",
-            "environmentType": "Development",
-            "resourceGroupId": "/subscriptions/abc123/resourceGroups/rg-demo-ml",
-            "expirationDate": (now + timedelta(days=1)).isoformat(),  # EXPIRES TOMORROW
-            "provisioningState": "Succeeded"
-        },
-        {
-            "name": "staging-database",
-            "projectName": "data-platform",
-            "user": "david@company.com",
-            "catalogName": "database-catalog",
-            "environmentType": "Staging",
-            "resourceGroupId": "/subscriptions/abc123/resourceGroups/rg-staging-db",
-            "expirationDate": (now + timedelta(days=2)).isoformat(),  # Expires in 2 days
-            "provisioningState": "Succeeded"
-        },
-        {
-            "name": "poc-iot-simulator",
-            "projectName": "iot-platform",
-            "user": "eve@company.com",
-            "catalogName": "iot-catalog",
-            "environmentType": "Development",
-            "resourceGroupId": "/subscriptions/abc123/resourceGroups/rg-poc-iot",
-            "expirationDate": (now - timedelta(hours=6)).isoformat(),  # EXPIRED 6 hours ago
-            "provisioningState": "Succeeded"
-        }
-    ]
+    mock_envs = {
+        "name": [
+            "dev-frontend-app",
+            "test-backend-api",
+            "demo-ml-workspace",
+            "staging-database",
+            "poc-iot-simulator",
+        ],
+        "projectName": [
+            "customer-portal",
+            "customer-portal",
+            "ai-initiatives",
+            "data-platform",
+            "iot-platform",
+        ],
+        "user": [
+            "alice@company.com",
+            "bob@company.com",
+            "carol@company.com",
+            "david@company.com",
+            "eve@company.com",
+        ],
+        "catalogName": [
+            "production-catalog",
+            "production-catalog",
+            "ml-catalog",
+            "database-catalog",
+            "iot-catalog",
+        ],
+        "environmentType": [
+            "Development",
+            "Testing",
+            "Development",
+            "Staging",
+            "Development",
+        ],
+        "resourceGroupId": [
+            "/subscriptions/abc123/resourceGroups/rg-dev-frontend",
+            "/subscriptions/abc123/resourceGroups/rg-test-backend",
+            "/subscriptions/abc123/resourceGroups/rg-demo-ml",
+            "/subscriptions/abc123/resourceGroups/rg-staging-db",
+            "/subscriptions/abc123/resourceGroups/rg-poc-iot",
+        ],
+        "expirationDate": [
+            (now - timedelta(days=2)).isoformat(),  # EXPIRED 2 days ago
+            now.isoformat(),  # EXPIRES TODAY
+            (now + timedelta(days=1)).isoformat(),  # EXPIRES TOMORROW
+            (now + timedelta(days=2)).isoformat(),  # Expires in 2 days
+            (now - timedelta(hours=6)).isoformat(),  # EXPIRED 6 hours ago
+        ],
+        "provisioningState": [
+            "Succeeded",
+            "Succeeded",
+            "Succeeded",
+            "Succeeded",
+            "Succeeded",
+        ],
+    }
     
     return mock_envs
 
 
+# Non-date columns copied into each output row, fetched in one C-level call
+_ENV_COLUMNS = itemgetter("name", "projectName", "user", "catalogName", "environmentType", "resourceGroupId")
+
+
+# Indexed by "already expired" (a bool) to pick the status without branching
+_STATUS = ("expiring", "expired")
+_ONE_SECOND = timedelta(seconds=1)
+
+# Slack status line per (status, days); anything else uses the per-status default
+_STATUS_TEXT = {
+    ("expiring", 0): lambda days: "🚨 *Expires TODAY*",
+    ("expiring", 1): lambda days: "⚠️ *Expires TOMORROW*",
+}
+_STATUS_TEXT_DEFAULT = {
+    "expired": lambda days: f"❌ *EXPIRED* ({abs(days)} days ago)",
+    "expiring": lambda days: f"⏰ Expires in {days} days",
+}
+
+
+# Environment detail section, filled from an output row of _project_survivors
+_ENV_TPL = (
+    "{statusText}\n"
+    "*Environment:* `{name}`\n"
+    "*Project:* {project}\n"
+    "*User:* {user}\n"
+    "*Type:* {environmentType}\n"
+    "*Expiration:* {expirationDate:.10}"
+)
+
+
+def _status_text(status, days):
+    """Format the Slack status line for an environment."""
+    return _STATUS_TEXT.get((status, days), _STATUS_TEXT_DEFAULT[status])(days)
+
+
+def _fixed_layout(s):
+    """True if s has the YYYY-MM-DD?HH:MM:SS separators _make_parser slices around."""
+    return s[4] == s[7] == '-' and s[13] == s[16] == ':'
+
+
+def _make_parser(sample):
+    """
+    Build a parser specialized for the exact shape of `sample`:
+    YYYY-MM-DDTHH:MM:SS, optionally .ffffff, then Z or +00:00.
+    The returned closure slices at fixed offsets and returns None for any
+    string of a different shape. Returns None if `sample` is not UTC-shaped.
+    """
+    if sample.endswith('Z'):
+        suffix = 'Z'
+    elif sample.endswith('+00:00'):
+        suffix = '+00:00'
+    else:
+        return None
+    
+    length = len(sample)
+    body = length - len(suffix)
+    
+    if body == 19:
+        def parse(s):
+            if len(s) != length or not s.endswith(suffix) or not _fixed_layout(s):
+                return None
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+                            tzinfo=timezone.utc)
+    elif body == 26 and sample[19] == '.':
+        def parse(s):
+            if len(s) != length or not s.endswith(suffix) or not _fixed_layout(s) or s[19] != '.':
+                return None
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+                            int(s[20:26]), tzinfo=timezone.utc)
+    else:
+        return None
+    
+    return parse
+
+
+# Parser specialized on the last sample whose shape did not match
+_parser = None
+
+# Shape gate for parse_expiration_date: obvious non-dates are rejected before
+# the (exception-raising) parsers run. It is a loose superset of the formats
+# documented for Python 3.11 fromisoformat(), which makes the final call
+# (undocumented leniency, such as stray trailing digits, is not covered):
+# extended or basic dates (2026-10-14, 20261014) and ISO week dates
+# (2026-W42-3), then optionally any single separator character, a time of
+# HH[:MM[:SS]] with or without colons and a '.'/',' fraction of any length
+# (Azure emits 7 digits), and a 'Z' or +/-HH[:MM[:SS[.ffffff]]] offset.
+# Pre-3.11 fromisoformat() is stricter and rejects some of these itself.
+_ISO_TIME = r'\d{2}(?::?\d{2}(?::?\d{2})?)?(?:[.,]\d+)?'
+_ISO_RE = re.compile(r'\d{4}(?:-?\d{2}-?\d{2}|-?W\d{2}(?:-?\d)?)'
+                     rf'(?:.{_ISO_TIME}(?:Z|[+-]{_ISO_TIME})?)?')
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_expiration_date(expiration_str):
-    """Parse expiration date from ISO format string."""
-    if not expiration_str:
+    """
+    Parse expiration date from ISO format string.
+    Memoized on the raw string: environments tend to share a handful of
+    distinct expiration timestamps. Callers must skip None/empty values.
+    """
+    global _parser
+    
+    if not _ISO_RE.fullmatch(expiration_str):
+        print(f"⚠️  Failed to parse date '{expiration_str}': not an ISO-8601 timestamp")
         return None
     
+    # Well-formed shape: only out-of-range fields (e.g. month 13) can still fail
     try:
-        if expiration_str.endswith('Z'):
-            return datetime.fromisoformat(expiration_str.replace('Z', '+00:00'))
-        else:
-            dt = datetime.fromisoformat(expiration_str)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-    except Exception as e:
+        if _parser is not None:
+            dt = _parser(expiration_str)
+            if dt is not None:
+                return dt
+        
+        # First call or format surprise: respecialize on this sample and
+        # take the general path for it
+        _parser = _make_parser(expiration_str)
+        
+        s = expiration_str
+        if _NEEDS_Z_REPLACE and s.endswith('Z'):
+            s = s[:-1] + '+00:00'
+        dt = datetime.fromisoformat(s)
+    except ValueError as e:
         print(f"⚠️  Failed to parse date '{expiration_str}': {e}")
         return None
+    
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
 
 
-def check_expiring_environments(mock_envs, warn_days=3):
-    """Check environments and return those expiring soon or already expired."""
-    now = datetime.now(timezone.utc)
+def check_expiring_environments(mock_envs, warn_days=3, limit=10, now=None):
+    """
+    Check environments and return those expiring soon or already expired.
+    
+    Returns (expiring, total_count, expired_count): output dicts are built
+    only for the first `limit` matches, while the counts cover all of them.
+    
+    Precondition: expirationDate values are UTC-normalized ISO strings, so
+    their first 19 characters sort lexicographically in chronological order.
+    That lets far-future environments be rejected with a string compare
+    before any parsing happens.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
     warn_threshold = now + timedelta(days=warn_days)
+    threshold_iso = warn_threshold.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    
+    # Filter phase touches only the expirationDate column: cheap string
+    # prefilter first, then parse and compare the remaining candidates
+    survivors = [
+        (i, expiration_date)
+        for i, expiration_str in enumerate(mock_envs["expirationDate"])
+        if expiration_str
+        and expiration_str[:19] <= threshold_iso
+        and (expiration_date := parse_expiration_date(expiration_str)) is not None
+        and expiration_date <= warn_threshold
+    ]
+    
+    expired_count = sum(1 for _, expiration_date in survivors if expiration_date < now)
     
+    return _project_survivors(mock_envs, survivors[:limit], now), len(survivors), expired_count
+
+
+def _project_survivors(mock_envs, survivors, now):
+    """Build output dicts for (index, expiration_date) pairs of the column store."""
+    # Projection phase gathers the remaining columns for survivors only;
+    # columns are bound to locals once so row access is plain list indexing
+    names, projects, users, catalogs, env_types, rg_ids = _ENV_COLUMNS(mock_envs)
     expiring = []
     
-    for env in mock_envs:
-        expiration_str = env.get("expirationDate")
-        
-        if not expiration_str:
-            continue
-        
-        expiration_date = parse_expiration_date(expiration_str)
+    for i, expiration_date in survivors:
+        # Floor division keeps timedelta.days rounding for negative durations
+        delta_s = (expiration_date - now) // _ONE_SECOND
+        days_until_expiration = delta_s // 86400
+        status = _STATUS[delta_s < 0]
         
-        if not expiration_date:
-            continue
-        
-        # Check if expired or expiring soon
-        if expiration_date <= warn_threshold:
-            days_until_expiration = (expiration_date - now).days
-            status = "expired" if expiration_date < now else "expiring"
-            
-            expiring.append({
-                "name": env.get("name"),
-                "project": env.get("projectName"),
-                "user": env.get("user"),
-                "catalogName": env.get("catalogName"),
-                "environmentType": env.get("environmentType"),
-                "resourceGroupId": env.get("resourceGroupId"),
-                "expirationDate": expiration_date.isoformat(),
-                "daysUntilExpiration": days_until_expiration,
-                "status": status
-            })
+        expiring.append({
+            "name": names[i],
+            "project": projects[i],
+            "user": users[i],
+            "catalogName": catalogs[i],
+            "environmentType": env_types[i],
+            "resourceGroupId": rg_ids[i],
+            "expirationDate": expiration_date.isoformat(),
+            "daysUntilExpiration": days_until_expiration,
+            "status": status,
+            "statusText": _status_text(status, days_until_expiration)
+        })
     
     return expiring
 
 
-def send_slack_notification(expiring_envs):
-    """Send Slack notification about expiring environments."""
-    webhook_url = os.environ.get("SLACK_WEBHOOK_URL")
-    mock_mode = os.environ.get("SLACK_MOCK", "0") in ("1", "true", "True")
+_NO_EXPIRATION = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def _expiration_prefix_key(expiration_str):
+    """Bisect key on the UTC second prefix; rows without an expiration sort last."""
+    return expiration_str[:19] if expiration_str else '\uffff'
+
+
+def sort_by_expiration(mock_envs):
+    """
+    Return a copy of the column store ordered chronologically by
+    expirationDate, with rows lacking one last.
+    """
+    expirations = mock_envs["expirationDate"]
+    order = sorted(
+        range(len(expirations)),
+        key=lambda i: (expirations[i] and parse_expiration_date(expirations[i])) or _NO_EXPIRATION
+    )
+    return {field: [column[i] for i in order] for field, column in mock_envs.items()}
+
+
+def _count_expiring_by(expirations, moment, inclusive):
+    """
+    Binary-search how many leading rows of a sorted expirationDate column
+    expire before `moment` (or at it, when inclusive).
+    """
+    moment_iso = moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    cut = bisect.bisect_right(expirations, moment_iso, key=_expiration_prefix_key)
     
-    if not webhook_url:
-        print("❌ SLACK_WEBHOOK_URL not configured!")
-        return False
+    # Rows in the same second as `moment` can still fall after it
+    while cut and expirations[cut - 1][:19] == moment_iso:
+        expiration_date = parse_expiration_date(expirations[cut - 1])
+        if expiration_date and (expiration_date <= moment if inclusive else expiration_date < moment):
+            break
+        cut -= 1
+    
+    return cut
+
+
+def check_expiring_environments_sorted(mock_envs_sorted, warn_days=3, limit=10, now=None):
+    """
+    Variant of check_expiring_environments for a column store ordered by
+    sort_by_expiration(). Expiring rows then form a prefix, so the cutoff is
+    found with a binary search and only the first `limit` rows are parsed.
+    
+    Precondition: every expirationDate is a valid UTC-normalized ISO string
+    or missing; lexicographic order of the 19-char prefix is chronological.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    warn_threshold = now + timedelta(days=warn_days)
+    expirations = mock_envs_sorted["expirationDate"]
+    
+    total_count = _count_expiring_by(expirations, warn_threshold, inclusive=True)
+    expired_count = _count_expiring_by(expirations, now, inclusive=False)
     
-    if not expiring_envs:
+    survivors = [(i, parse_expiration_date(expirations[i])) for i in range(min(total_count, limit))]
+    return _project_survivors(mock_envs_sorted, survivors, now), total_count, expired_count
+
+
+# UTC designator stripped before datetime64 parsing, and any other offset
+# (searched after the date part), which sends the batch down the scalar path
+_UTC_SUFFIX_RE = re.compile(r'(?:Z|[+-]00:?00)$')
+_OFFSET_RE = re.compile(r'[+-]\d{2}(?::?\d{2})?$')
+
+
+def _naive_utc(expiration_str):
+    """
+    expiration_str without its UTC suffix, for datetime64; ValueError on other
+    offsets. Values the scalar gate rejects map to '' (NaT), since datetime64
+    would accept partial dates such as '2026-10'.
+    """
+    if not expiration_str or not _ISO_RE.fullmatch(expiration_str):
+        return ""
+    body = _UTC_SUFFIX_RE.sub('', expiration_str)
+    if _OFFSET_RE.search(body, 10):
+        raise ValueError(f"non-UTC offset in {expiration_str!r}")
+    return body
+
+
+def check_expiring_environments_np(mock_envs, warn_days=3, limit=10, now=None):
+    """
+    Vectorized variant of check_expiring_environments for large environment
+    lists: one datetime64 parse and one compare in NumPy.
+    
+    Same precondition (UTC-normalized ISO strings); the filter and counts run
+    at microsecond resolution, like the scalar path. Falls back to the scalar
+    path if any value is not a parseable ISO date or carries a non-UTC offset.
+    """
+    import numpy as np
+    
+    if now is None:
+        now = datetime.now(timezone.utc)
+    warn_threshold = now + timedelta(days=warn_days)
+    now_us = np.datetime64(now.astimezone(timezone.utc).replace(tzinfo=None), 'us')
+    threshold_us = np.datetime64(warn_threshold.astimezone(timezone.utc).replace(tzinfo=None), 'us')
+    
+    # datetime64 does not take offsets, so only the UTC suffix is dropped;
+    # missing values become '' which parses to NaT (never <= threshold)
+    try:
+        exps = np.array(
+            [_naive_utc(s) for s in mock_envs["expirationDate"]],
+            dtype='datetime64[us]'
+        )
+    except ValueError:
+        return check_expiring_environments(mock_envs, warn_days=warn_days, limit=limit, now=now)
+    
+    idx = np.flatnonzero(exps <= threshold_us)
+    expired_count = int((exps[idx] < now_us).sum())
+    
+    # Only the first `limit` rows are materialized, through the shared projection
+    expirations = mock_envs["expirationDate"]
+    survivors = [
+        (i, expiration_date)
+        for i in idx[:limit].tolist()
+        if (expiration_date := parse_expiration_date(expirations[i])) is not None
+    ]
+    
+    return _project_survivors(mock_envs, survivors, now), len(idx), expired_count
+
+
+def _webhook_urls():
+    """Webhook targets: SLACK_WEBHOOK_URLS (comma-separated) or SLACK_WEBHOOK_URL."""
+    urls = os.environ.get("SLACK_WEBHOOK_URLS")
+    if urls:
+        return [url.strip() for url in urls.split(',') if url.strip()]
+    url = os.environ.get("SLACK_WEBHOOK_URL", "").strip()
+    return [url] if url else []
+
+
+def _post_webhook(webhook_url, body):
+    """POST an already-serialized JSON body to one webhook."""
+    try:
+        print(f"📤 Sending to Slack webhook: {webhook_url[:50]}...")
+        request = Request(webhook_url, data=body, headers={"Content-Type": "application/json"})
+        with urlopen(request, timeout=10) as response:
+            response.read()
+        return True
+    except HTTPError as e:
+        print(f"❌ Failed to send Slack notification: {e}")
+        print(f"   Response: {e.read().decode('utf-8', 'replace')}")
+        return False
+    except (OSError, ValueError, HTTPException) as e:
+        # Malformed URLs raise ValueError (unknown url type) or http.client.InvalidURL
+        print(f"❌ Failed to send Slack notification: {e}")
+        return False
+
+
+def _build_alert_payload(expiring_envs, total_count, expired_count, now):
+    """Build the webhook payload for one expiration check result."""
+    if total_count == 0:
         message = "✅ All Azure Deployment Environments are healthy - no expiration warnings."
         payload = {"text": message}
     else:
-        expired_count = sum(1 for e in expiring_envs if e["status"] == "expired")
-        expiring_count = len(expiring_envs) - expired_count
+        expiring_count = total_count - expired_count
         
         warning_emoji = "🚨" if expired_count > 0 else "⚠️"
         
@@ -174,39 +478,21 @@ def send_slack_notification(expiring_envs):
         ]
         
         # Add details for each environment
-        for env in expiring_envs[:10]:
-            days = env["daysUntilExpiration"]
-            
-            if env["status"] == "expired":
-                status_text = f"❌ *EXPIRED* ({abs(days)} days ago)"
-            elif days == 0:
-                status_text = f"🚨 *Expires TODAY*"
-            elif days == 1:
-                status_text = f"⚠️ *Expires TOMORROW*"
-            else:
-                status_text = f"⏰ Expires in {days} days"
-            
+        for env in expiring_envs:
             blocks.append({
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": (
-                        f"{status_text}\n"
-                        f"*Environment:* `{env['name']}`\n"
-                        f"*Project:* {env['project']}\n"
-                        f"*User:* {env.get('user', 'N/A')}\n"
-                        f"*Type:* {env.get('environmentType', 'N/A')}\n"
-                        f"*Expiration:* {env['expirationDate'][:10]}"
-                    )
+                    "text": _ENV_TPL.format_map(env)
                 }
             })
         
-        if len(expiring_envs) > 10:
+        if total_count > len(expiring_envs):
             blocks.append({
                 "type": "context",
                 "elements": [{
                     "type": "mrkdwn",
-                    "text": f"_...and {len(expiring_envs) - 10} more environment(s)_"
+                    "text": f"_...and {total_count - len(expiring_envs)} more environment(s)_"
                 }]
             })
         
@@ -215,7 +501,7 @@ def send_slack_notification(expiring_envs):
             "type": "context",
             "elements": [{
                 "type": "mrkdwn",
-                "text": f"🤖 _Automated alert from Azure Deployment Environments | {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC_"
+                "text": f"🤖 _Automated alert from Azure Deployment Environments | {now.strftime('%Y-%m-%d %H:%M:%S')} UTC_"
             }]
         })
         
@@ -224,86 +510,181 @@ def send_slack_notification(expiring_envs):
             "blocks": blocks
         }
     
+    return payload
+
+
+def _send_payload(payload, now):
+    """Print (mock mode) or POST a payload to every configured webhook."""
+    webhook_urls = _webhook_urls()
+    mock_mode = os.environ.get("SLACK_MOCK", "0") in ("1", "true", "True")
+    pretty = os.environ.get("SLACK_MOCK_PRETTY", "0") in ("1", "true", "True")
+    
+    if not webhook_urls:
+        print("❌ SLACK_WEBHOOK_URL not configured!")
+        return False
+    
     # Mock mode or actual send
     if mock_mode:
-        timestamp = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        timestamp = now.strftime('%Y-%m-%dT%H:%M:%SZ')
         print(f"\n{'='*70}")
         print(f"[MOCK SLACK MESSAGE {timestamp}]")
         print(f"{'='*70}")
-        print(json.dumps(payload, indent=2, ensure_ascii=False))
+        dumped = json.dumps(
+            payload,
+            indent=2 if pretty else None,
+            separators=None if pretty else (',', ':'),
+            ensure_ascii=False
+        )
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is not None:
+            # Flush the text layer first so the raw write lands in order
+            sys.stdout.flush()
+            buffer.write(dumped.encode('utf-8') + b'\n')
+            buffer.flush()
+        else:
+            # Text-only stream (pytest capture, IDE console, StringIO redirect)
+            sys.stdout.write(dumped + '\n')
         print(f"{'='*70}\n")
         return True
     
-    try:
-        print(f"📤 Sending to Slack webhook: {webhook_url[:50]}...")
-        response = requests.post(
-            webhook_url,
-            data=json.dumps(payload),
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        response.raise_for_status()
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    # Fan out concurrently when several webhooks (channels) are configured
+    with ThreadPoolExecutor(max_workers=min(8, len(webhook_urls))) as pool:
+        results = list(pool.map(lambda url: _post_webhook(url, body), webhook_urls))
+    
+    if all(results):
         print("✅ Successfully sent Slack notification!")
         return True
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to send Slack notification: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"   Response: {e.response.text}")
-        return False
+    return False
+
+
+class AlertBatcher:
+    """
+    Coalesce several alert runs into a single webhook POST.
+    add() renders one check result; flush() sends everything collected so far
+    as one message, with a divider between runs. A long-running caller would
+    call flush() on a timer.
+    """
+    
+    def __init__(self, now=None):
+        self.now = now
+        self._payloads = []
+    
+    def add(self, expiring_envs, total_count, expired_count):
+        """Render one (expiring, total_count, expired_count) result."""
+        now = self.now or datetime.now(timezone.utc)
+        self._payloads.append(_build_alert_payload(expiring_envs, total_count, expired_count, now))
+    
+    def flush(self):
+        """Send the collected alerts as one message; returns True on success."""
+        if not self._payloads:
+            return True
+        
+        payloads, self._payloads = self._payloads, []
+        if len(payloads) == 1:
+            payload = payloads[0]
+        else:
+            blocks = []
+            for batch in payloads:
+                if blocks:
+                    blocks.append({"type": "divider"})
+                blocks.extend(batch.get("blocks") or [
+                    {"type": "section", "text": {"type": "mrkdwn", "text": batch["text"]}}
+                ])
+            alerts = [batch for batch in payloads if "blocks" in batch]
+            payload = {
+                "text": (alerts or payloads)[0]["text"],
+                "blocks": blocks
+            }
+        
+        return _send_payload(payload, self.now or datetime.now(timezone.utc))
+
+
+def send_slack_notification(expiring_envs, total_count, expired_count, now=None):
+    """
+    Send Slack notification about expiring environments.
+    Takes the (expiring, total_count, expired_count) result of
+    check_expiring_environments; expiring is already capped.
+    """
+    batcher = AlertBatcher(now=now)
+    batcher.add(expiring_envs, total_count, expired_count)
+    return batcher.flush()
+
+
+def _drain(buf):
+    """Write buffered output to stdout in one call and reset the buffer."""
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    buf.seek(0)
+    buf.truncate()
 
 
 def main():
     """Main demo function."""
-    print("\n" + "="*70)
-    print("🎬 DEMO: Azure Deployment Environment Expiration Alerts")
-    print("="*70 + "\n")
+    # Single clock read shared by every step of the run
+    now = datetime.now(timezone.utc)
+    
+    # Collect output and write it in a few large chunks instead of per line
+    buf = io.StringIO()
+    w = buf.write
+    
+    w("\n" + "="*70 + "\n")
+    w("🎬 DEMO: Azure Deployment Environment Expiration Alerts\n")
+    w("="*70 + "\n\n")
     
-    print("📋 Configuration:")
-    print(f"   SLACK_WEBHOOK_URL: {'✅ Configured' if os.environ.get('SLACK_WEBHOOK_URL') else '❌ NOT SET'}")
-    print(f"   SLACK_MOCK: {os.environ.get('SLACK_MOCK', '0')}")
-    print(f"   EXPIRATION_WARN_DAYS: {os.environ.get('EXPIRATION_WARN_DAYS', '3')}")
-    print()
+    w("📋 Configuration:\n")
+    w(f"   SLACK_WEBHOOK_URL: {'✅ Configured' if _webhook_urls() else '❌ NOT SET'}\n")
+    w(f"   SLACK_MOCK: {os.environ.get('SLACK_MOCK', '0')}\n")
+    w(f"   EXPIRATION_WARN_DAYS: {os.environ.get('EXPIRATION_WARN_DAYS', '3')}\n")
+    w("\n")
     
     # Create mock environments
-    print("🏗️  Creating mock Azure Deployment Environments...")
-    mock_envs = create_mock_environments()
-    print(f"✅ Created {len(mock_envs)} mock environments\n")
+    w("🏗️  Creating mock Azure Deployment Environments...\n")
+    mock_envs = create_mock_environments(now=now)
+    w(f"✅ Created {len(mock_envs['name'])} mock environments\n\n")
     
     # Check for expiring environments
     warn_days = int(os.environ.get('EXPIRATION_WARN_DAYS', '3'))
-    print(f"🔍 Checking for environments expiring within {warn_days} days...")
-    expiring_envs = check_expiring_environments(mock_envs, warn_days=warn_days)
+    w(f"🔍 Checking for environments expiring within {warn_days} days...\n")
+    expiring_envs, total_count, expired_count = check_expiring_environments(mock_envs, warn_days=warn_days, now=now)
     
-    print(f"✅ Found {len(expiring_envs)} environment(s) expiring within {warn_days} days\n")
+    w(f"✅ Found {total_count} environment(s) expiring within {warn_days} days\n\n")
     
     if expiring_envs:
-        print("📊 Expiring Environments Details:")
-        print("-" * 70)
+        w("📊 Expiring Environments Details:\n")
+        w("-" * 70 + "\n")
         for i, env in enumerate(expiring_envs, 1):
             status_emoji = "❌" if env['status'] == 'expired' else "⚠️"
-            print(f"\n{i}. {status_emoji} {env['name']}")
-            print(f"   Project: {env['project']}")
-            print(f"   User: {env.get('user', 'N/A')}")
-            print(f"   Type: {env.get('environmentType', 'N/A')}")
-            print(f"   Expiration: {env['expirationDate']}")
-            print(f"   Days until expiration: {env['daysUntilExpiration']}")
-            print(f"   Status: {env['status'].upper()}")
-        print()
+            w(f"\n{i}. {status_emoji} {env['name']}\n")
+            w(f"   Project: {env['project']}\n")
+            w(f"   User: {env.get('user', 'N/A')}\n")
+            w(f"   Type: {env.get('environmentType', 'N/A')}\n")
+            w(f"   Expiration: {env['expirationDate']}\n")
+            w(f"   Days until expiration: {env['daysUntilExpiration']}\n")
+            w(f"   Status: {env['status'].upper()}\n")
+        w("\n")
     
     # Send Slack notification
-    print("📨 Sending Slack notification...")
-    print("-" * 70)
-    success = send_slack_notification(expiring_envs)
+    w("📨 Sending Slack notification...\n")
+    w("-" * 70 + "\n")
+    # Checkpoint: show progress before the (possibly slow) send
+    _drain(buf)
+    batcher = AlertBatcher(now=now)
+    batcher.add(expiring_envs, total_count, expired_count)
+    success = batcher.flush()
     
     if success:
-        print("\n" + "="*70)
-        print("✅ DEMO COMPLETED SUCCESSFULLY!")
-        print("="*70 + "\n")
+        w("\n" + "="*70 + "\n")
+        w("✅ DEMO COMPLETED SUCCESSFULLY!\n")
+        w("="*70 + "\n\n")
+        _drain(buf)
         return 0
     else:
-        print("\n" + "="*70)
-        print("⚠️  DEMO COMPLETED WITH WARNINGS")
-        print("="*70 + "\n")
+        w("\n" + "="*70 + "\n")
+        w("⚠️  DEMO COMPLETED WITH WARNINGS\n")
+        w("="*70 + "\n\n")
+        _drain(buf)
         return 1
 
 
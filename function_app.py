@@ -1,84 +1,210 @@
 import azure.functions as func
 import logging
 import os
+import re
+import sys
 import json
+import types
+import threading
+import time
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple, Union
 import slack as slack_integration
 
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import heavy dependencies after basic setup
-try:
-    import requests
-    from azure.identity import DefaultAzureCredential
-    from azure.mgmt.devcenter import DevCenterMgmtClient
-    from azure.developer.devcenter import DevCenterClient
-    from azure.mgmt.resource import ResourceManagementClient
-    from azure.core.rest import HttpRequest
+@functools.cache
+def _azure() -> types.SimpleNamespace:
+    """
+    Import the Azure SDKs on first use rather than at worker startup, to keep cold starts short.
+    Returns a namespace of the SDK classes used in this module.
+    """
+    try:
+        from azure.core.exceptions import HttpResponseError
+        from azure.core.rest import HttpRequest
+        from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+        from azure.mgmt.devcenter import DevCenterMgmtClient
+        from azure.developer.devcenter import DevCenterClient
+        from azure.mgmt.resource import ResourceManagementClient
+        from azure.mgmt.resourcegraph import ResourceGraphClient
+        from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+    except Exception as e:
+        logger.error(f"Failed to import dependencies: {e}", exc_info=True)
+        raise
     logger.info("Successfully imported all Azure dependencies")
-except Exception as e:
-    logger.error(f"Failed to import dependencies: {e}", exc_info=True)
-    raise
+    return types.SimpleNamespace(
+        HttpResponseError=HttpResponseError,
+        HttpRequest=HttpRequest,
+        DefaultAzureCredential=DefaultAzureCredential,
+        ManagedIdentityCredential=ManagedIdentityCredential,
+        DevCenterMgmtClient=DevCenterMgmtClient,
+        DevCenterClient=DevCenterClient,
+        ResourceManagementClient=ResourceManagementClient,
+        ResourceGraphClient=ResourceGraphClient,
+        QueryRequest=QueryRequest,
+        QueryRequestOptions=QueryRequestOptions,
+    )
+
+
+# Debug dumps of raw API payloads use orjson when available
+try:
+    import orjson
+    _dumps = lambda o: orjson.dumps(o, default=str, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _dumps = lambda o: json.dumps(o, indent=2, default=str)
 
 app = func.FunctionApp()
 logger.info("Function app initialized")
 
+# Upper bound on concurrent Azure REST calls when fanning out per project / RG
+_FETCH_WORKERS = 16
+
+# Requested page size ($top) for the DevCenter environments list
+_ENV_PAGE_SIZE = 500
+
+# Resource group name segment of an ARM resource ID
+_ARM_RG_RE = re.compile(r'/resourceGroups/([^/]+)', re.IGNORECASE)
 
+
+@functools.lru_cache(maxsize=1)
 def get_credential():
-    """Get Azure credential for authentication."""
-    return DefaultAzureCredential()
+    """
+    Get the Azure credential shared by all clients, so tokens are cached across calls.
+    Set AZURE_USE_MSI_ONLY=1 to use managed identity directly and skip the credential chain.
+    """
+    if os.getenv('AZURE_USE_MSI_ONLY', '').lower() in ("1", "true", "yes"):
+        return _azure().ManagedIdentityCredential(client_id=os.getenv('AZURE_CLIENT_ID'))
+    return _azure().DefaultAzureCredential(
+        exclude_interactive_browser_credential=True,
+        exclude_visual_studio_code_credential=True
+    )
 
 
-def fetch_all_dev_centers_and_projects(mgmt_client) -> List[Dict]:
+def fetch_all_dev_centers_and_projects(mgmt_client) -> Iterator[Dict]:
     """
     Fetch all DevCenter projects using the DevCenter management client.
-    Returns list of dicts with 'project_name', 'resource_group', 'devcenter_name', 'devcenter_uri'.
+    Yields dicts with 'project_name', 'resource_group', 'devcenter_name', 'devcenter_uri'
+    as the paged results arrive.
     """
     logger.info("Fetching all DevCenter projects using management client...")
     
-    projects_info = []
+    project_count = 0
+    devcenter_count = 0
     
     try:
-        # List all DevCenters in the subscription
-        devcenters = list(mgmt_client.dev_centers.list_by_subscription())
-        logger.info(f"Found {len(devcenters)} DevCenters")
-        
-        # For each DevCenter, list its projects
-        for devcenter in devcenters:
+        # List all DevCenters in the subscription, and for each DevCenter its projects
+        for devcenter in mgmt_client.dev_centers.list_by_subscription():
+            devcenter_count += 1
             devcenter_name = devcenter.name
-            devcenter_rg = devcenter.id.split('/')[4]  # Extract resource group from resource ID
+            # Extract resource group from resource ID
+            match = _ARM_RG_RE.search(devcenter.id)
+            devcenter_rg = match.group(1) if match else None
             devcenter_uri = devcenter.dev_center_uri
             
             logger.info(f"Fetching projects for DevCenter '{devcenter_name}' in RG '{devcenter_rg}'...")
             
             try:
                 # List projects for this DevCenter
-                projects = list(mgmt_client.projects.list_by_resource_group(devcenter_rg))
-                
-                for project in projects:
+                for project in mgmt_client.projects.list_by_resource_group(devcenter_rg):
                     # Verify this project belongs to this DevCenter
-                    if hasattr(project, 'dev_center_id') and devcenter.id.lower() in project.dev_center_id.lower():
-                        projects_info.append({
+                    if devcenter.id.lower() in (getattr(project, 'dev_center_id', None) or '').lower():
+                        logger.info(f"  - Found project: {project.name}")
+                        project_count += 1
+                        yield {
                             'project_name': project.name,
                             'resource_group': devcenter_rg,
                             'devcenter_name': devcenter_name,
                             'devcenter_uri': devcenter_uri
-                        })
-                        logger.info(f"  - Found project: {project.name}")
+                        }
             
             except Exception as e:
                 logger.error(f"Error fetching projects for DevCenter '{devcenter_name}': {str(e)}", exc_info=True)
                 continue
-        
-        logger.info(f"Total projects found: {len(projects_info)}")
-        return projects_info
     
     except Exception as e:
         logger.error(f"Error fetching DevCenters: {str(e)}", exc_info=True)
-        return []
+    
+    logger.info(f"Total projects found: {project_count} across {devcenter_count} DevCenters")
+
+
+# (data plane API property, env dict key) pairs copied from the environments list response.
+# Env dicts carry their final shape from ingest on; fetch_all_environments adds
+# environmentResourceGroup, tags and owner_email, categorize_by_expiration adds daysUntilExpiration.
+_EXPOSED_FIELDS = (
+    ('catalogName', 'catalogName'),
+    ('environmentDefinitionName', 'environmentDefinition'),
+    ('environmentType', 'environmentType'),
+    ('user', 'user'),
+    ('provisioningState', 'provisioningState'),
+    ('resourceGroupId', 'resourceId'),
+)
+
+
+def _build_env_dict(env: Dict, project_name: str) -> Dict:
+    """Map a raw environment from the data plane API to our environment dict, parsing expirationDate."""
+    return {
+        'name': env.get('name'),
+        'projectName': project_name,
+        **{key: env.get(prop) for prop, key in _EXPOSED_FIELDS},
+        'expirationDate': parse_expiration_date(env.get('expirationDate'))
+    }
+
+
+# (env dict key, SDK model attribute) pairs for the SDK fallback paths
+_SDK_FIELDS = (
+    ('catalogName', 'catalog_name'),
+    ('environmentDefinition', 'environment_definition_name'),
+    ('environmentType', 'environment_type'),
+    ('user', 'user'),
+    ('provisioningState', 'provisioning_state'),
+    ('resourceId', 'resource_group_id'),
+)
+# Attribute names the expiration may be exposed under, in order of preference
+_SDK_EXPIRATION_ATTRS = ('expiration_date', 'expirationDate', 'expiration')
+
+
+def _build_sdk_env_dict(env, project_name: str) -> Dict:
+    """Map an environment model returned by the DevCenterClient SDK to our environment dict."""
+    expiration_value = next((v for v in (getattr(env, a, None) for a in _SDK_EXPIRATION_ATTRS) if v), None)
+    return {
+        'name': getattr(env, 'name', None),
+        'projectName': project_name,
+        **{key: getattr(env, attr, None) for key, attr in _SDK_FIELDS},
+        'expirationDate': parse_expiration_date(expiration_value)
+    }
+
+
+def _get_environments_page(devcenter_client, url: str) -> Dict:
+    """Send one environments list request and return the decoded page."""
+    response = devcenter_client.send_request(_azure().HttpRequest(method="GET", url=url))
+    response.raise_for_status()
+    return response.json()
+
+
+def _iter_env_pages(devcenter_client, project_name: str):
+    """
+    Yield raw pages of a project's environments, following nextLink.
+    The next page is requested on a background worker while the caller processes the current one.
+    """
+    url = f"/projects/{project_name}/environments?api-version=2025-02-01&$top={_ENV_PAGE_SIZE}"
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        page = _get_environments_page(devcenter_client, url)
+        logger.info("Environments page size for project '%s': requested %d, got %d%s",
+                    project_name, _ENV_PAGE_SIZE, len(page.get("value", ())),
+                    " (more pages follow)" if page.get("nextLink") else "")
+        while True:
+            next_link = page.get("nextLink")
+            logger.debug("next page link: %s", next_link)
+            next_page = prefetcher.submit(_get_environments_page, devcenter_client, next_link) if next_link else None
+            yield page
+            if next_page is None:
+                return
+            page = next_page.result()
 
 
 def fetch_environments_from_project(credential, devcenter_endpoint: str, project_name: str) -> List[Dict]:
@@ -91,7 +217,7 @@ def fetch_environments_from_project(credential, devcenter_endpoint: str, project
         logger.info(f"Creating DevCenterClient with endpoint: {devcenter_endpoint}")
         
         # Create data plane client with DevCenter endpoint
-        devcenter_client = DevCenterClient(endpoint=devcenter_endpoint, credential=credential)
+        devcenter_client = _azure().DevCenterClient(endpoint=devcenter_endpoint, credential=credential)
         
         # List all environments in the project
         environments = []
@@ -102,128 +228,37 @@ def fetch_environments_from_project(credential, devcenter_endpoint: str, project
             
             try:
                 # Use the SDK's send_request method which handles auth properly
-                relative_url = f"/projects/{project_name}/environments?api-version=2025-02-01"
-                print(f"🔧 DEBUG: Making request to: {relative_url}")
-                
-                request = HttpRequest(
-                    method="GET",
-                    url=relative_url
-                )
-                
-                print(f"� DEBUG: Sending request through DevCenterClient pipeline...")
-                response = devcenter_client.send_request(request)
-                response.raise_for_status()
-                
-                page = response.json()
-                logger.info(f"✅ DEBUG: Successfully got response via SDK pipeline")
-                logger.info(f"📊 DEBUG: Response has {len(page.get('value', []))} environments")
-                
-                env_count = 0
-                url = page.get("nextLink")  # For pagination
-                
-                logger.info(f"next page link: {url}")
-
-                for env in page.get("value", []):
-                    env_count += 1
-                    env_name = env.get("name", "unknown")
-                    logger.info(f"  Processing environment #{env_count}: {env_name}")
-                    
-                    # Print raw environment data for debugging
-                    logger.info(f"\n{'='*80}")
-                    logger.info(f"DEBUG: Environment #{env_count} - {env_name}")
-                    logger.info(f"{'='*80}")
-                    logger.info(f"Raw JSON keys: {list(env.keys())}")
-                    logger.info(f"Full JSON: {json.dumps(env, indent=2, default=str)}")
-                    logger.info(f"{'='*80}\n")
-                    
-                    expiration_from_api = env.get("expirationDate")
-                    logger.info(f"🔍 DEBUG: Raw expirationDate from API = '{expiration_from_api}' (type: {type(expiration_from_api)})")
+                for page in _iter_env_pages(devcenter_client, project_name):
+                    values = page.get("value", ())
+                    logger.debug("Page has %d environments", len(values))
                     
-                    env_dict = {
-                        'name': env.get("name"),
-                        'project_name': project_name,
-                        'catalogName': env.get("catalogName"),
-                        'environmentDefinitionName': env.get("environmentDefinitionName"),
-                        'environmentType': env.get("environmentType"),
-                        'user': env.get("user"),
-                        'provisioningState': env.get("provisioningState"),
-                        'resourceGroupId': env.get("resourceGroupId"),
-                        'expirationDate': expiration_from_api
-                    }
+                    # Raw environment data for debugging
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for env in values:
+                            logger.debug("Full JSON: %s", _dumps(env))
                     
-                    logger.info(f"✅ DEBUG: env_dict created with expirationDate = '{env_dict['expirationDate']}'")
-                    logger.info(f"📦 DEBUG: About to append to environments list")
-                    environments.append(env_dict)
-                    logger.info(f"✔️  DEBUG: Successfully appended. Total envs now: {len(environments)}")
-                
-                # Handle pagination
-                while url:
-                    logger.info(f"🔄 DEBUG: Following nextLink for pagination...")
-                    next_request = HttpRequest(method="GET", url=url)
-                    response = devcenter_client.send_request(next_request)
-                    response.raise_for_status()
-                    page = response.json()
-                    
-                    for env in page.get("value", []):
-                        env_count += 1
-                        env_name = env.get("name", "unknown")
-                        logger.info(f"  Processing environment #{env_count}: {env_name}")
-                        
-                        expiration_from_api = env.get("expirationDate")
-                        logger.info(f"🔍 DEBUG: Raw expirationDate from API = '{expiration_from_api}' (type: {type(expiration_from_api)})")
-                        
-                        env_dict = {
-                            'name': env.get("name"),
-                            'project_name': project_name,
-                            'catalogName': env.get("catalogName"),
-                            'environmentDefinitionName': env.get("environmentDefinitionName"),
-                            'environmentType': env.get("environmentType"),
-                            'user': env.get("user"),
-                            'provisioningState': env.get("provisioningState"),
-                            'resourceGroupId': env.get("resourceGroupId"),
-                            'expirationDate': expiration_from_api
-                        }
-                        
-                        environments.append(env_dict)
-                    
-                    url = page.get("nextLink")
+                    environments.extend(_build_env_dict(env, project_name) for env in values)
             
-            except requests.exceptions.HTTPError as http_err:
-                if http_err.response.status_code == 403:
+            except _azure().HttpResponseError as http_err:
+                if http_err.status_code == 403:
                     logger.error(f"❌ 403 Forbidden when calling REST API")
-                    logger.error(f"URL: {http_err.response.url}")
-                    logger.error(f"Response body: {http_err.response.text}")
-                    logger.error(f"Response headers: {dict(http_err.response.headers)}")
+                    if http_err.response is not None:
+                        logger.error(f"URL: {http_err.response.request.url}")
+                        logger.error(f"Response body: {http_err.response.text()}")
+                        logger.error(f"Response headers: {dict(http_err.response.headers)}")
                     logger.warning(f"Credentials may not have 'Deployment Environments Reader' role")
                     logger.warning(f"Managed Identity needs 'Deployment Environments Reader' role on the DevCenter project")
                     logger.info(f"Falling back to SDK (which may not have expirationDate)...")
                     
-                    # Fallback to SDK approach
+                    # Fallback to SDK approach, discarding any pages read before the 403
+                    environments.clear()
                     paged_envs = devcenter_client.list_all_environments(project_name=project_name)
                     env_count = 0
                     for env in paged_envs:
                         env_count += 1
-                        logger.info(f"  Processing environment #{env_count}: {env.name if hasattr(env, 'name') else 'unknown'}")
-                        
-                        # Try multiple attribute names for expiration
-                        expiration_value = None
-                        for attr in ['expiration_date', 'expirationDate', 'expiration']:
-                            if hasattr(env, attr):
-                                expiration_value = getattr(env, attr)
-                                if expiration_value:
-                                    break
+                        logger.debug("  Processing environment #%d: %s", env_count, getattr(env, 'name', 'unknown'))
                         
-                        env_dict = {
-                            'name': env.name if hasattr(env, 'name') else None,
-                            'project_name': project_name,
-                            'catalogName': env.catalog_name if hasattr(env, 'catalog_name') else None,
-                            'environmentDefinitionName': env.environment_definition_name if hasattr(env, 'environment_definition_name') else None,
-                            'environmentType': env.environment_type if hasattr(env, 'environment_type') else None,
-                            'user': env.user if hasattr(env, 'user') else None,
-                            'provisioningState': env.provisioning_state if hasattr(env, 'provisioning_state') else None,
-                            'resourceGroupId': env.resource_group_id if hasattr(env, 'resource_group_id') else None,
-                            'expirationDate': expiration_value
-                        }
+                        env_dict = _build_sdk_env_dict(env, project_name)
                         environments.append(env_dict)
                 else:
                     raise
@@ -237,18 +272,8 @@ def fetch_environments_from_project(credential, devcenter_endpoint: str, project
                 # List environments for "me" (the service principal/managed identity)
                 paged_envs = devcenter_client.list_environments(project_name=project_name)
                 for env in paged_envs:
-                    logger.info(f"  Found environment: {env.name if hasattr(env, 'name') else 'unknown'}")
-                    env_dict = {
-                        'name': env.name if hasattr(env, 'name') else None,
-                        'project_name': project_name,
-                        'catalogName': env.catalog_name if hasattr(env, 'catalog_name') else None,
-                        'environmentDefinitionName': env.environment_definition_name if hasattr(env, 'environment_definition_name') else None,
-                        'environmentType': env.environment_type if hasattr(env, 'environment_type') else None,
-                        'user': env.user if hasattr(env, 'user') else None,
-                        'provisioningState': env.provisioning_state if hasattr(env, 'provisioning_state') else None,
-                        'resourceGroupId': env.resource_group_id if hasattr(env, 'resource_group_id') else None,
-                        'expirationDate': env.expiration_date if hasattr(env, 'expiration_date') else None
-                    }
+                    logger.debug("  Found environment: %s", getattr(env, 'name', 'unknown'))
+                    env_dict = _build_sdk_env_dict(env, project_name)
                     environments.append(env_dict)
             except Exception as inner_e:
                 logger.error(f"Alternative API also failed: {str(inner_e)}", exc_info=True)
@@ -261,18 +286,138 @@ def fetch_environments_from_project(credential, devcenter_endpoint: str, project
         return []
 
 
-def fetch_resource_group_tags(credential, subscription_id: str, rg_name: str) -> Dict[str, str]:
+@functools.lru_cache(maxsize=1)
+def _rm_client(subscription_id: str):
+    """Shared ResourceManagementClient, so its pipeline/transport is built once."""
+    return _azure().ResourceManagementClient(get_credential(), subscription_id)
+
+
+# Resource group tags cached for back-to-back invocations of a warm instance
+# (manual re-runs, run_on_startup), never across daily runs:
+# (subscription ID, lower-cased RG name) -> (monotonic expiry time, tags).
+# Bounded to _RG_TAGS_MAX entries, pruned on write.
+_RG_TAGS_TTL = 600
+_RG_TAGS_MAX = 2048
+_RG_TAGS: Dict[Tuple[str, str], Tuple[float, Dict[str, str]]] = {}
+_rg_tags_lock = threading.Lock()
+
+
+def _get_cached_rg_tags(subscription_id: str, rg_name: str) -> Optional[Dict[str, str]]:
+    """Return cached tags for a resource group, or None if not cached or expired."""
+    entry = _RG_TAGS.get((subscription_id, rg_name.lower()))
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_rg_tags(subscription_id: str, rg_name: str, tags: Dict[str, str]) -> None:
+    key = (subscription_id, rg_name.lower())
+    with _rg_tags_lock:
+        now = time.monotonic()
+        # Re-inserted so dict order stays oldest-write first
+        _RG_TAGS.pop(key, None)
+        if len(_RG_TAGS) >= _RG_TAGS_MAX:
+            for stale in [k for k, (expires, _) in _RG_TAGS.items() if expires <= now]:
+                del _RG_TAGS[stale]
+            # Still full of live entries: evict the oldest writes
+            while len(_RG_TAGS) >= _RG_TAGS_MAX:
+                del _RG_TAGS[next(iter(_RG_TAGS))]
+        _RG_TAGS[key] = (now + _RG_TAGS_TTL, tags)
+
+
+def fetch_resource_group_tags(subscription_id: str, rg_name: str) -> Dict[str, str]:
     """
     Fetch tags from a resource group.
     Returns dictionary of tags, or empty dict on error.
+    Successful lookups are cached for _RG_TAGS_TTL seconds per (subscription, resource group).
     """
+    tags = _get_cached_rg_tags(subscription_id, rg_name)
+    if tags is not None:
+        return tags
     try:
-        resource_client = ResourceManagementClient(credential, subscription_id)
-        rg = resource_client.resource_groups.get(rg_name)
-        return rg.tags or {}
+        rg = _rm_client(subscription_id).resource_groups.get(rg_name)
     except Exception as e:
         logger.warning(f"Could not fetch tags for resource group '{rg_name}': {str(e)}")
         return {}
+    tags = rg.tags or {}
+    _cache_rg_tags(subscription_id, rg_name, tags)
+    return tags
+
+
+def _resource_graph_query(credential, subscription_id: str, query: str) -> List[Dict]:
+    """Run a Resource Graph query against one subscription, following skip tokens. Returns all rows."""
+    azure = _azure()
+    graph_client = azure.ResourceGraphClient(credential)
+    rows = []
+    skip_token = None
+    while True:
+        result = graph_client.resources(azure.QueryRequest(
+            subscriptions=[subscription_id],
+            query=query,
+            options=azure.QueryRequestOptions(skip_token=skip_token, result_format='objectArray')
+        ))
+        rows.extend(result.data)
+        skip_token = result.skip_token
+        if not skip_token:
+            return rows
+
+
+def fetch_dev_center_projects_via_graph(credential, subscription_id: str) -> List[Dict]:
+    """
+    Fetch all DevCenter projects with two Resource Graph queries (projects and DevCenters), joined on DevCenter ID.
+    Returns the same dicts as fetch_all_dev_centers_and_projects. Raises on query failure.
+    """
+    devcenters = {
+        row['id']: row
+        for row in _resource_graph_query(credential, subscription_id, (
+            "resources"
+            " | where type =~ 'microsoft.devcenter/devcenters'"
+            " | project id = tolower(id), name, resourceGroup, devCenterUri = tostring(properties.devCenterUri)"
+        ))
+    }
+    projects = _resource_graph_query(credential, subscription_id, (
+        "resources"
+        " | where type =~ 'microsoft.devcenter/projects'"
+        " | project name, devCenterId = tolower(tostring(properties.devCenterId))"
+    ))
+    logger.info(f"Found {len(devcenters)} DevCenters and {len(projects)} projects via Resource Graph")
+    
+    projects_info = []
+    for project in projects:
+        devcenter = devcenters.get(project['devCenterId'])
+        if devcenter is None:
+            logger.warning(f"Skipping project '{project['name']}': DevCenter '{project['devCenterId']}' not found")
+            continue
+        projects_info.append({
+            'project_name': project['name'],
+            'resource_group': devcenter['resourceGroup'],
+            'devcenter_name': devcenter['name'],
+            'devcenter_uri': devcenter['devCenterUri']
+        })
+    return projects_info
+
+
+def fetch_resource_group_tags_batch(credential, subscription_id: str, rg_names: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Fetch tags for many resource groups with a single Azure Resource Graph query.
+    Returns dictionary of lower-cased RG name -> tags. Raises on query failure.
+    """
+    if not rg_names:
+        return {}
+    
+    names = ','.join(f"'{name}'" for name in rg_names)
+    query = (
+        "resourcecontainers"
+        " | where type =~ 'microsoft.resources/subscriptions/resourcegroups'"
+        f" and name in~ ({names})"
+        " | project name, tags"
+    )
+    
+    tags_by_rg = {row['name'].lower(): row.get('tags') or {}
+                  for row in _resource_graph_query(credential, subscription_id, query)}
+    
+    logger.info(f"Fetched tags for {len(tags_by_rg)} resource groups via Resource Graph")
+    return tags_by_rg
 
 
 def fetch_all_environments() -> List[Dict]:
@@ -280,7 +425,7 @@ def fetch_all_environments() -> List[Dict]:
     Fetch all Azure Deployment Environments using DevCenter management and data plane APIs.
     
     Steps:
-    1. Use DevCenterMgmtClient to list all DevCenters and their projects
+    1. Use Resource Graph (or DevCenterMgmtClient as fallback) to list all DevCenters and their projects
     2. For each project, use DevCenterClient (data plane) to list environments
     3. Extract expiration dates from environment objects
     4. Correlate with resource groups to get owner tags
@@ -295,64 +440,100 @@ def fetch_all_environments() -> List[Dict]:
     if not subscription_id:
         raise ValueError("Missing required environment variable: ADE_SUBSCRIPTION_ID")
     
-    # Step 1: Get all DevCenter projects using management client
-    logger.info(f"REACHING DEVCENTER MGMT CLIENT NOW")
+    # Step 1: Get all DevCenter projects via Resource Graph, falling back to the management client
     logger.info(f"🔐 Credential type: {type(credential).__name__}")
-    logger.info(f"🔐 Credential object: {credential}")
-    mgmt_client = DevCenterMgmtClient(credential, subscription_id)
-    projects = fetch_all_dev_centers_and_projects(mgmt_client)
-    
-    if not projects:
-        logger.warning("No DevCenter projects found in subscription")
-        return []
+    try:
+        projects = fetch_dev_center_projects_via_graph(credential, subscription_id)
+    except Exception as e:
+        logger.warning(f"Resource Graph project query failed, using DevCenter management client: {str(e)}")
+        mgmt_client = _azure().DevCenterMgmtClient(credential, subscription_id)
+        projects = fetch_all_dev_centers_and_projects(mgmt_client)
     
     all_environments = []
     
-    # Step 2: For each project, fetch environments using data plane API
-    for project_info in projects:
-        project_name = project_info.get('project_name')
-        devcenter_uri = project_info.get('devcenter_uri')
-        
-        if not project_name or not devcenter_uri:
-            logger.warning(f"Skipping project with missing info: {project_info}")
-            continue
-        
-        logger.info(f"Processing project '{project_name}' with DevCenter URI '{devcenter_uri}'...")
-        
-        # Fetch environments from this project using data plane API
-        envs = fetch_environments_from_project(credential, devcenter_uri, project_name)
-        print(f"🔄 DEBUG: fetch_environments_from_project returned {len(envs)} environments")
-        
-        # Step 3: Correlate with resource groups to get owner tags
-        for env in envs:
-            env_name = env.get('name')
-            exp_before = env.get('expirationDate')
-            print(f"🔄 DEBUG: Processing env '{env_name}' - expirationDate BEFORE tagging: '{exp_before}'")
-            
-            # Derive resource group name from resourceGroupId if available
-            rg_id = env.get('resourceGroupId')
-            if rg_id:
-                # Extract RG name from ID: /subscriptions/.../resourceGroups/<name>
-                rg_name = rg_id.split('/')[-1] if '/' in rg_id else None
-            else:
-                # Fallback: assume {projectName}-{environmentName} pattern
-                rg_name = f"{project_name}-{env_name}"
-            
-            if rg_name:
-                # Fetch tags from the environment's resource group
-                rg_tags = fetch_resource_group_tags(credential, subscription_id, rg_name)
-                env['environment_resource_group'] = rg_name
-                env['tags'] = rg_tags
+    # Step 2: Fetch environments from all projects concurrently (I/O bound; one
+    # shared credential, whose token fetch is thread-safe). Projects are submitted
+    # as they are enumerated, so fetching overlaps with the management client's paging.
+    valid_projects = []
+    futures = []
+    with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as executor:
+        for project_info in projects:
+            if not project_info.get('project_name') or not project_info.get('devcenter_uri'):
+                logger.warning(f"Skipping project with missing info: {project_info}")
+                continue
+            valid_projects.append(project_info)
+            futures.append(executor.submit(fetch_environments_from_project, credential,
+                                           project_info['devcenter_uri'], project_info['project_name']))
+        
+        if not valid_projects:
+            logger.warning("No DevCenter projects found in subscription")
+            return []
+        
+        # Collect in submission order so results stay deterministic
+        for project_info, future in zip(valid_projects, futures):
+            project_name = project_info['project_name']
+            envs = future.result()
             
-            exp_after = env.get('expirationDate')
-            print(f"➕ DEBUG: About to append env '{env_name}' - expirationDate AFTER tagging: '{exp_after}'")
-            all_environments.append(env)
-            print(f"✅ DEBUG: Appended. Total all_environments: {len(all_environments)}")
+            for env in envs:
+                env_name = env.get('name')
+                
+                # Derive resource group name from the environment's resource group ID if available
+                rg_id = env.get('resourceId')
+                if rg_id:
+                    # Extract RG name from ID: /subscriptions/.../resourceGroups/<name>
+                    match = _ARM_RG_RE.search(rg_id)
+                    rg_name = match.group(1) if match else None
+                else:
+                    # Fallback: assume {projectName}-{environmentName} pattern
+                    rg_name = f"{project_name}-{env_name}"
+                
+                if rg_name:
+                    env['environmentResourceGroup'] = rg_name
+                
+                all_environments.append(env)
+    
+    # Step 3: Correlate with resource groups to get owner tags. RGs tagged within
+    # the last _RG_TAGS_TTL come from the cache, and the rest are fetched in one
+    # Resource Graph query.
+    rg_names = sorted({env['environmentResourceGroup'] for env in all_environments
+                       if env.get('environmentResourceGroup')})
+    tags_by_rg = {}
+    missing = []
+    for rg_name in rg_names:
+        tags = _get_cached_rg_tags(subscription_id, rg_name)
+        if tags is None:
+            missing.append(rg_name)
+        else:
+            tags_by_rg[rg_name] = tags
+    logger.info(f"Resource group tags: {len(tags_by_rg)} cached, {len(missing)} to fetch")
+    
+    if missing:
+        try:
+            graph_tags = fetch_resource_group_tags_batch(credential, subscription_id, missing)
+            for rg_name in missing:
+                tags_by_rg[rg_name] = graph_tags.get(rg_name.lower(), {})
+                _cache_rg_tags(subscription_id, rg_name, tags_by_rg[rg_name])
+        except Exception as e:
+            # Fall back to one GET per resource group
+            logger.warning(f"Resource Graph tag query failed, fetching tags per resource group: {str(e)}")
+            with ThreadPoolExecutor(max_workers=max(1, min(_FETCH_WORKERS, len(missing)))) as executor:
+                rg_tags = executor.map(fetch_resource_group_tags, [subscription_id] * len(missing), missing)
+                tags_by_rg.update(zip(missing, rg_tags))
+    
+    for env in all_environments:
+        rg_name = env.get('environmentResourceGroup')
+        if rg_name in tags_by_rg:
+            env['tags'] = tags_by_rg[rg_name]
+        env['owner_email'] = extract_owner_email(env) or "unknown"
     
     logger.info(f"Found total of {len(all_environments)} Azure Deployment Environments across all projects")
     return all_environments
 
 
+# Resource group tag keys (lower-cased) that hold the environment owner's email
+_OWNER_TAG_KEYS = frozenset({'created_by', 'createdby', 'created-by', 'owner', 'user-email'})
+
+
 def extract_owner_email(env: Dict) -> Optional[str]:
     """
     Extract owner email from environment.
@@ -360,12 +541,10 @@ def extract_owner_email(env: Dict) -> Optional[str]:
     1. Resource group tags (created_by, owner, etc.) - most likely to have email
     2. Environment 'user' field - AAD object ID from DevCenter API
     """
-    # Try resource group tags first
-    tags = env.get('tags', {})
-    if tags:
-        for key, value in tags.items():
-            if key.lower() in ('created_by', 'createdby', 'created-by', 'owner', 'user-email'):
-                return value
+    # Try resource group tags first (first matching tag wins)
+    for key, value in (env.get('tags') or {}).items():
+        if key.lower() in _OWNER_TAG_KEYS:
+            return value
     
     # Fall back to user field from DevCenter API (AAD object ID)
     user = env.get('user')
@@ -375,129 +554,88 @@ def extract_owner_email(env: Dict) -> Optional[str]:
     return None
 
 
-def parse_expiration_date(expiration_str: Optional[str]) -> Optional[datetime]:
-    """Parse expiration date from ISO format string or date string."""
-    if not expiration_str:
-        logger.info(f"[PARSE] No expiration string provided")
+# datetime.fromisoformat accepts a trailing 'Z' from Python 3.11 on
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(s: str) -> datetime:
+        return datetime.fromisoformat(s[:-1] + '+00:00' if s.endswith('Z') else s)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_expiration_date(expiration: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """
+    Parse expiration date from an ISO 8601 datetime or date string (SDK datetimes pass through).
+    Values without a timezone are treated as UTC. Returns None if missing or unparseable.
+    Memoized, as environments created from the same definition often share an expiration.
+    """
+    if not expiration:
         return None
     
-    logger.info(f"[PARSE] Parsing expiration string: '{expiration_str}' (type: {type(expiration_str).__name__})")
+    if isinstance(expiration, datetime):
+        dt = expiration
+    else:
+        try:
+            dt = _parse_iso(expiration)
+        except (TypeError, ValueError):
+            return None
     
-    try:
-        if expiration_str.endswith('Z'):
-            result = datetime.fromisoformat(expiration_str.replace('Z', '+00:00'))
-            logger.info(f"[PARSE] Parsed as ISO with Z suffix: {result}")
-            return result
-        
-        if 'T' in expiration_str:
-            dt = datetime.fromisoformat(expiration_str)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            logger.info(f"[PARSE] Parsed as ISO datetime: {dt}")
-            return dt
-        
-        dt = datetime.strptime(expiration_str, '%Y-%m-%d')
-        result = dt.replace(tzinfo=timezone.utc)
-        logger.info(f"[PARSE] Parsed as date only: {result}")
-        return result
-        
-    except Exception as e:
-        logger.warning(f"[PARSE] Failed to parse date '{expiration_str}': {e}")
-        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+# Category for each bucket index returned by np.searchsorted in categorize_by_expiration
+_BUCKET_NAMES = ('expired', 'tomorrow', '3_days', '7_days', 'future')
+# Categories that need attention (everything but 'future')
+_ATTENTION_BUCKETS = _BUCKET_NAMES[:-1]
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
 
 
-def categorize_by_expiration(environments: List[Dict]) -> Dict[str, List[Dict]]:
-    """Categorize environments by expiration timeframes."""
-    now = datetime.now(timezone.utc)
+def categorize_by_expiration(environments: List[Dict], now: Optional[datetime] = None) -> Dict[str, List[Dict]]:
+    """
+    Categorize environments by expiration timeframes relative to now (default: current UTC time).
+    Sets daysUntilExpiration on each dated environment and files the same dict under its category.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
     tomorrow = now + timedelta(days=1)
     three_days = now + timedelta(days=3)
     seven_days = now + timedelta(days=7)
     
-    logger.info(f"\n{'='*60}")
-    logger.info(f"[CATEGORIZE] Current time (UTC): {now}")
-    logger.info(f"[CATEGORIZE] Tomorrow threshold: {tomorrow}")
-    logger.info(f"[CATEGORIZE] 3-day threshold: {three_days}")
-    logger.info(f"[CATEGORIZE] 7-day threshold: {seven_days}")
-    logger.info(f"[CATEGORIZE] Total environments to process: {len(environments)}")
-    logger.info(f"{'='*60}\n")
-    
-    categories = {
-        'expired': [],
-        'tomorrow': [],
-        '3_days': [],
-        '7_days': [],
-        'future': []
-    }
+    logger.info("[CATEGORIZE] Current time (UTC): %s, environments to process: %d", now, len(environments))
+    logger.debug("[CATEGORIZE] Thresholds: tomorrow=%s, 3-days=%s, 7-days=%s", tomorrow, three_days, seven_days)
     
-    for idx, env in enumerate(environments, 1):
-        env_name = env.get('name', 'UNKNOWN')
-        logger.info(f"\n--- Processing Environment #{idx}: {env_name} ---")
-        
-        # Get expiration date from top level (from DevCenter API)
-        expiration_value = env.get('expirationDate')
-        print(f"DEBUG: expiration_value = {expiration_value}, type = {type(expiration_value)}")
-        
-        if not expiration_value:
-            logger.info(f"[CATEGORIZE] Environment '{env_name}' has NO expiration date - SKIPPING")
-            continue
-        
-        logger.info(f"[CATEGORIZE] Raw expiration value: {expiration_value} (type: {type(expiration_value).__name__})")
-        
-        # Convert datetime object to string if needed, or parse if string
-        if isinstance(expiration_value, datetime):
-            expiration_date = expiration_value
-            logger.info(f"[CATEGORIZE] Value is already datetime object: {expiration_date}")
-        else:
-            logger.info(f"[CATEGORIZE] Value is string, calling parse_expiration_date...")
-            expiration_date = parse_expiration_date(expiration_value)
-        
-        if not expiration_date:
-            logger.warning(f"[CATEGORIZE] Could not parse expiration date for '{env_name}': {expiration_value} - SKIPPING")
-            continue
-        
-        # Get owner using the updated extract_owner_email function
-        owner_email = extract_owner_email(env)
-        logger.info(f"[CATEGORIZE] Owner email: {owner_email}")
-        
-        # Calculate days until expiration
-        time_diff = expiration_date - now
-        days_until_expiration = time_diff.days
-        hours_until_expiration = time_diff.total_seconds() / 3600
+    categories = {name: [] for name in _BUCKET_NAMES}
+    
+    # Expiration date is parsed to a datetime (or None) at ingest
+    dated = [env for env in environments if env.get('expirationDate') is not None]
+    if len(dated) < len(environments):
+        logger.debug("[CATEGORIZE] %d environment(s) have NO expiration date - SKIPPING", len(environments) - len(dated))
+    
+    # Bucket every expiration at once: microseconds since epoch against the
+    # sorted thresholds. Expired is strictly before now, the other buckets
+    # include their upper bound.
+    import numpy as np
+    
+    exps = np.fromiter(((env['expirationDate'] - _EPOCH) // _ONE_US for env in dated),
+                       dtype=np.int64, count=len(dated))
+    thresholds = np.array([(t - _EPOCH) // _ONE_US for t in (now - _ONE_US, tomorrow, three_days, seven_days)],
+                          dtype=np.int64)
+    buckets = np.searchsorted(thresholds, exps, side='left')
+    
+    for bucket, env in zip(buckets.tolist(), dated):
+        expiration_date = env['expirationDate']
         
-        logger.info(f"[CATEGORIZE] Expiration date: {expiration_date}")
-        logger.info(f"[CATEGORIZE] Time difference: {time_diff}")
-        logger.info(f"[CATEGORIZE] Days until expiration: {days_until_expiration}")
-        logger.info(f"[CATEGORIZE] Hours until expiration: {hours_until_expiration:.2f}")
+        # Calculate days until expiration; the env dict itself goes into its category
+        env['daysUntilExpiration'] = days_until_expiration = (expiration_date - now).days
         
-        env_info = {
-            "name": env.get("name"),
-            "owner_email": owner_email or "unknown",
-            "expirationDate": expiration_date.isoformat(),
-            "daysUntilExpiration": days_until_expiration,
-            "projectName": env.get("project_name"),
-            "environmentResourceGroup": env.get("environment_resource_group"),
-            "environmentDefinition": env.get("environmentDefinitionName"),
-            "catalogName": env.get("catalogName"),
-            "provisioningState": env.get("provisioningState"),
-            "resourceId": env.get("resourceGroupId")
-        }
+        category = _BUCKET_NAMES[bucket]
+        categories[category].append(env)
         
-        # Determine category with detailed logging
-        if expiration_date < now:
-            logger.info(f"[CATEGORIZE] ❌ EXPIRED (expiration {expiration_date} < now {now})")
-            categories['expired'].append(env_info)
-        elif expiration_date <= tomorrow:
-            logger.info(f"[CATEGORIZE] 🚨 EXPIRES TOMORROW (expiration {expiration_date} <= tomorrow {tomorrow})")
-            categories['tomorrow'].append(env_info)
-        elif expiration_date <= three_days:
-            logger.info(f"[CATEGORIZE] ⚠️  EXPIRES IN 3 DAYS (expiration {expiration_date} <= 3-days {three_days})")
-            categories['3_days'].append(env_info)
-        elif expiration_date <= seven_days:
-            logger.info(f"[CATEGORIZE] ⏰ EXPIRES IN 7 DAYS (expiration {expiration_date} <= 7-days {seven_days})")
-            categories['7_days'].append(env_info)
-        else:
-            logger.info(f"[CATEGORIZE] ✅ FUTURE (expiration {expiration_date} > 7-days {seven_days})")
-            categories['future'].append(env_info)
+        logger.debug("[CATEGORIZE] '%s' owner=%s expires=%s (%d days) -> %s",
+                     env.get('name', 'UNKNOWN'), env.get('owner_email'), expiration_date, days_until_expiration, category)
     
     return categories
 
@@ -507,58 +645,153 @@ def check_expiring_environments() -> Tuple[Dict[str, List[Dict]], int]:
     environments = fetch_all_environments()
     categorized = categorize_by_expiration(environments)
     
-    total_attention = (
-        len(categorized['expired']) +
-        len(categorized['tomorrow']) +
-        len(categorized['3_days']) +
-        len(categorized['7_days'])
-    )
+    counts = {category: len(categorized[category]) for category in _ATTENTION_BUCKETS}
+    total_attention = sum(counts.values())
     
-    logger.info(f"Summary: {len(categorized['expired'])} expired, "
-                f"{len(categorized['tomorrow'])} tomorrow, "
-                f"{len(categorized['3_days'])} in 3 days, "
-                f"{len(categorized['7_days'])} in 7 days")
+    logger.info(f"Summary: {counts['expired']} expired, "
+                f"{counts['tomorrow']} tomorrow, "
+                f"{counts['3_days']} in 3 days, "
+                f"{counts['7_days']} in 7 days")
     
     return categorized, total_attention
 
 
+# Concurrent personal DMs, and the minimum spacing between their starts (seconds)
+_SLACK_DM_WORKERS = 8
+_SLACK_DM_INTERVAL = 0.05
+_dm_lock = threading.Lock()
+_dm_next_at = 0.0
+
+
+def _throttled_dm(user_id: str, message: str, blocks: Optional[List[Dict]] = None) -> bool:
+    """Send one personal DM, keeping request starts at least _SLACK_DM_INTERVAL apart."""
+    global _dm_next_at
+    with _dm_lock:
+        now = time.monotonic()
+        wait = _dm_next_at - now
+        _dm_next_at = max(now, _dm_next_at) + _SLACK_DM_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+    try:
+        return bool(slack_integration.send_slack_message(user_id, message, blocks=blocks))
+    except Exception as e:
+        logger.error(f"Error sending Slack DM to {user_id}: {e}")
+        return False
+
+
+# Block Kit divider, shared by every message (blocks are only serialized, never mutated)
+_DIVIDER = {"type": "divider"}
+
+# Section headings for an owner's consolidated DM, by category
+_OWNER_SECTION_TITLES = {
+    'expired': "*❌ Expired*",
+    'tomorrow': "*🚨 Expiring tomorrow*",
+    '3_days': "*⚠️ Expiring within 3 days*",
+    '7_days': "*⏰ Expiring within 7 days*",
+    'future': "*✅ Expiring later*",
+}
+
+
+# Environments listed per category in an owner's DM. chat.postMessage takes at most
+# 50 blocks; with every category present a DM is 1 + 5 x (2 + limit + 1) <= 41 blocks.
+_OWNER_SECTION_LIMIT = 5
+
+
+def _owner_env_text(environment: Dict) -> str:
+    """Details of one environment for its owner's DM."""
+    return (
+        f"*{environment.get('name')}* expires on "
+        f"*{environment['expirationDate']:%Y-%m-%d}* (in *{environment.get('daysUntilExpiration')}* days).\n"
+        f"Project: {environment.get('projectName')}\n"
+        f"Resource Group: {environment.get('environmentResourceGroup')}\n"
+        f"Environment Definition: {environment.get('environmentDefinition')}\n"
+        f"Catalog: {environment.get('catalogName')}\n"
+        f"Provisioning State: {environment.get('provisioningState')}\n"
+        f"Resource ID: {environment.get('resourceId')}"
+    )
+
+
+def _notify_owner(owner_email: str, by_category: Dict[str, List[Dict]], email_map: Dict[str, str]) -> Optional[bool]:
+    """
+    Resolve an owner's Slack user and send one DM covering all of their environments, grouped by category.
+    Returns True if sent, False if sending failed, None if the owner could not be resolved.
+    """
+    if email_map:
+        user_id = email_map.get(slack_integration.normalize_email(owner_email))
+    else:
+        user_id = slack_integration.get_user_by_email(owner_email)
+    if not user_id:
+        logger.warning(f"Could not find Slack user ID for email: {owner_email}")
+        return None
+    
+    env_count = sum(len(envs) for envs in by_category.values())
+    message = (
+        f"Hello! You have {env_count} Azure Deployment Environment(s) with an upcoming expiration. "
+        f"Please take necessary action to extend or decommission them."
+    )
+    blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": message}}]
+    for category, envs in by_category.items():
+        blocks.append(_DIVIDER)
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": _OWNER_SECTION_TITLES.get(category, f"*{category}*")}})
+        blocks.extend({"type": "section", "text": {"type": "mrkdwn", "text": _owner_env_text(e)}}
+                      for e in envs[:_OWNER_SECTION_LIMIT])
+        if len(envs) > _OWNER_SECTION_LIMIT:
+            blocks.append({"type": "context", "elements": [
+                {"type": "mrkdwn", "text": f"…and {len(envs) - _OWNER_SECTION_LIMIT} more"}]})
+    
+    sent = _throttled_dm(user_id, message, blocks)
+    if not sent:
+        logger.error(f"Failed to send Slack notification to {owner_email} for {env_count} environment(s)")
+    return sent
+
+
 def send_personal_slack_notification(env: Dict[str, List[Dict]]) -> bool:
 # struct is category [expired, tomorrow, 3_days, 7_days] ->
 #  env_details [ 
 #       name, owner_email, expirationDate, daysUntilExpiration, projectName, environmentResourceGroup, 
 #       environmentDefinition, catalogName, provisioningState, resourceId 
 # ]
-    """Send personal Slack notification to environment owner about expiration."""
+    """Send each environment owner one personal Slack notification covering all their expiring environments."""
+    # Resolve owners against one workspace listing instead of a lookup per environment
+    email_map = slack_integration.build_email_to_user_id_map()
+    
+    # Group environments by owner (case-insensitive), then by category in display order
+    by_owner = defaultdict(lambda: defaultdict(list))
     for category in env:
-        logger.info(f"Sending personal Slack notifications for category: {category}")
         for environment in env[category]:
             owner_email = environment.get("owner_email")
             if not owner_email or "unknown" in owner_email:
                 logger.warning(f"Skipping Slack notification for environment '{environment.get('name')}' due to unknown owner email")
                 continue
-            
-            user_id = slack_integration.get_user_by_email(owner_email)
-            if not user_id:
-                logger.warning(f"Could not find Slack user ID for email: {owner_email}")
-                continue
-            
-            message = (
-                f"Hello! Your Azure Deployment Environment *{environment.get('name')}* is set to expire on "
-                f"*{environment.get('expirationDate')[:10]}* (in *{environment.get('daysUntilExpiration')}* days).\n"
-                f"Please take necessary action to extend or decommission it.\n\n"
-                f"Project: {environment.get('projectName')}\n"
-                f"Resource Group: {environment.get('environmentResourceGroup')}\n"
-                f"Environment Definition: {environment.get('environmentDefinition')}\n"
-                f"Catalog: {environment.get('catalogName')}\n"
-                f"Provisioning State: {environment.get('provisioningState')}\n"
-                f"Resource ID: {environment.get('resourceId')}"
-            )
-            
-            sent = slack_integration.send_slack_message(user_id, message)
-            if sent:
-                logger.info(f"Sent Slack notification to {owner_email} for environment '{environment.get('name')}'")
-            else:
-                logger.error(f"Failed to send Slack notification to {owner_email} for environment '{environment.get('name')}'")
+            by_owner[owner_email.lower()][category].append(environment)
+    logger.info(f"Sending personal Slack notifications to {len(by_owner)} owner(s)")
+    
+    # Owners are independent: resolve and DM them concurrently; _throttled_dm spaces out request starts
+    with ThreadPoolExecutor(max_workers=_SLACK_DM_WORKERS) as executor:
+        results = list(executor.map(lambda item: _notify_owner(item[0], item[1], email_map), by_owner.items()))
+    
+    attempted = [sent for sent in results if sent is not None]
+    logger.info(f"Sent {sum(attempted)} of {len(attempted)} personal Slack notification(s)")
+    return all(attempted)
+
+
+# Per-environment line formats for the channel alert (fields of the categorized env dict)
+_EXPIRED_FMT = "• `{name}`\n  Owner: {owner_email}\n  Expired: {abs_days} day(s) ago"
+_EXPIRES_FMT = "• `{name}`\n  Owner: {owner_email}\n  Expires: {expirationDate:%Y-%m-%d}"
+_DAYS_LEFT_FMT = "• `{name}`\n  Owner: {owner_email}\n  Days left: {daysUntilExpiration}"
+
+# (category, heading format, line format, max environments listed), in display order
+_ALERT_SECTIONS = (
+    ('expired', "*❌ EXPIRED ({count})*", _EXPIRED_FMT, 5),
+    ('tomorrow', "*🚨 TOMORROW ({count})*", _EXPIRES_FMT, 5),
+    ('3_days', "*⚠️ 3 DAYS ({count})*", _DAYS_LEFT_FMT, 3),
+    ('7_days', "*⏰ 7 DAYS ({count})*", _DAYS_LEFT_FMT, 3),
+)
+
+
+def _env_block(env: Dict, fmt: str) -> Dict:
+    """Render one categorized environment as a Slack mrkdwn section using fmt."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": fmt.format(abs_days=abs(env["daysUntilExpiration"]), **env)}}
 
 
 def send_slack_notification(categorized_envs: Dict[str, List[Dict]], total_count: int) -> bool:
@@ -575,12 +808,11 @@ def send_slack_notification(categorized_envs: Dict[str, List[Dict]], total_count
         message = "✅ All Azure Deployment Environments are healthy - no expiration warnings."
         payload = [{ "type": "section", "text": { "type" : "plain_text", "text": message} }]
     else:
-        expired_count = len(categorized_envs['expired'])
-        tomorrow_count = len(categorized_envs['tomorrow'])
-        three_days_count = len(categorized_envs['3_days'])
-        seven_days_count = len(categorized_envs['7_days'])
+        # Environments listed per section, sliced once up front
+        heads = {category: categorized_envs[category][:limit] for category, _, _, limit in _ALERT_SECTIONS}
+        counts = {category: len(categorized_envs[category]) for category in _ATTENTION_BUCKETS}
         
-        warning_emoji = "🚨" if expired_count > 0 else "⚠️"
+        warning_emoji = "🚨" if counts['expired'] > 0 else "⚠️"
         text = f"{warning_emoji} Azure Deployment Environment Expiration Alert"
         
         blocks = [
@@ -594,90 +826,48 @@ def send_slack_notification(categorized_envs: Dict[str, List[Dict]], total_count
                     "type": "mrkdwn",
                     "text": (
                         f"*Summary:* {total_count} environment(s) need attention\n\n"
-                        f"❌ {expired_count} already expired\n"
-                        f"🚨 {tomorrow_count} expire tomorrow\n"
-                        f"⚠️ {three_days_count} expire in 3 days\n"
-                        f"⏰ {seven_days_count} expire in 7 days"
+                        f"❌ {counts['expired']} already expired\n"
+                        f"🚨 {counts['tomorrow']} expire tomorrow\n"
+                        f"⚠️ {counts['3_days']} expire in 3 days\n"
+                        f"⏰ {counts['7_days']} expire in 7 days"
                     )
                 }
             },
-            {"type": "divider"}
+            _DIVIDER
         ]
         
-        # Add expired environments
-        if expired_count > 0:
-            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*❌ EXPIRED ({expired_count})*"}})
-            for env in categorized_envs['expired'][:5]:
-                days = abs(env["daysUntilExpiration"])
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• `{env['name']}`\n  Owner: {env['owner_email']}\n  Expired: {days} day(s) ago"
-                    }
-                })
-        
-        # Add tomorrow's expirations
-        if tomorrow_count > 0:
-            blocks.append({"type": "divider"})
-            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*🚨 TOMORROW ({tomorrow_count})*"}})
-            for env in categorized_envs['tomorrow'][:5]:
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• `{env['name']}`\n  Owner: {env['owner_email']}\n  Expires: {env['expirationDate'][:10]}"
-                    }
-                })
-        
-        # Add 3-day warnings
-        if three_days_count > 0:
-            blocks.append({"type": "divider"})
-            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*⚠️ 3 DAYS ({three_days_count})*"}})
-            for env in categorized_envs['3_days'][:3]:
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• `{env['name']}`\n  Owner: {env['owner_email']}\n  Days left: {env['daysUntilExpiration']}"
-                    }
-                })
-        
-        # Add 7-day warnings
-        if seven_days_count > 0:
-            blocks.append({"type": "divider"})
-            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*⏰ 7 DAYS ({seven_days_count})*"}})
-            for env in categorized_envs['7_days'][:3]:
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"• `{env['name']}`\n  Owner: {env['owner_email']}\n  Days left: {env['daysUntilExpiration']}"
-                    }
-                })
+        # Add a heading plus the first few environments for each non-empty category
+        for i, (category, heading, fmt, _) in enumerate(_ALERT_SECTIONS):
+            if not counts[category]:
+                continue
+            if i:
+                blocks.append(_DIVIDER)
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": heading.format(count=counts[category])}})
+            blocks.extend(_env_block(env, fmt) for env in heads[category])
         
-        blocks.append({"type": "divider"})
+        generated_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+        blocks.append(_DIVIDER)
         blocks.append({
             "type": "context",
             "elements": [{
                 "type": "mrkdwn",
-                "text": f"🤖 _ADE Expiration Monitor | {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}_"
+                "text": f"🤖 _ADE Expiration Monitor | {generated_at}_"
             }]
         })
         
         payload = blocks
     
     if mock_mode:
-        logger.info(f"[MOCK] Would send Slack notification")
-        logger.info(json.dumps(payload, indent=2))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[MOCK] Would send Slack notification: %s", json.dumps(payload, indent=2))
         return True
     
     try:
-        sent = slack_integration.send_slack_message(channel_id,"", payload)
+        sent = slack_integration.send_slack_message(channel_id, "", blocks=payload)
         logger.info("Slack notification sent successfully" if sent else "Failed to send Slack notification")
         return True
     except Exception as e:
-        logger.error(f"Failed to send Slack notification: {e}")
+        logger.error("Failed to send Slack notification: %s", e)
         return False
 
 
@@ -697,6 +887,10 @@ def expirationDateNotice(myTimer: func.TimerRequest) -> None:
         
         logger.info(f"Found {total_count} environment(s) requiring attention")
         
+        if total_count == 0 and os.environ.get("ADE_REPORT_WHEN_EMPTY", "").lower() not in ("1", "true", "yes"):
+            logger.info("No expiring environments, skipping notifications")
+            return
+        
         # send notifications to env owners
         success_personal = send_personal_slack_notification(categorized_envs)
 
@@ -43,10 +43,11 @@ def main():
         print(f"RESULTS: Found {total_count} environment(s) requiring attention")
         print("="*60)
         
-        print(f"  Expired: {len(categorized_envs['expired'])}")
-        print(f"  Tomorrow: {len(categorized_envs['tomorrow'])}")
-        print(f"  3 Days: {len(categorized_envs['3_days'])}")
-        print(f"  7 Days: {len(categorized_envs['7_days'])}")
+        counts = {category: len(categorized_envs[category]) for category in ('expired', 'tomorrow', '3_days', '7_days')}
+        print(f"  Expired: {counts['expired']}")
+        print(f"  Tomorrow: {counts['tomorrow']}")
+        print(f"  3 Days: {counts['3_days']}")
+        print(f"  7 Days: {counts['7_days']}")
         print()
         
         # Send notification
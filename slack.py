@@ -2,7 +2,106 @@ import urllib3
 import json
 import logging
 import os
-      
+import random
+import re
+import threading
+import time
+
+# Request bodies are serialized with orjson when available
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    _dumps = lambda o: json.dumps(o).encode('utf-8')
+
+# Shared connection pool so Slack API calls reuse kept-alive TLS connections
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=16, retries=False,
+                            timeout=urllib3.Timeout(connect=3.0, read=10.0))
+
+# Slack API errors worth retrying, and errors that will never succeed on retry
+_RETRYABLE = frozenset({"internal_error", "service_unavailable", "rate_limited", "ratelimited", "timeout"})
+_FAIL_FAST = frozenset({"channel_not_found", "invalid_auth", "not_in_channel"})
+
+# Slack errors that guarantee a non-idempotent call (chat.postMessage) was not applied
+_NOT_APPLIED = frozenset({"rate_limited", "ratelimited"})
+
+
+def _with_retry(fn, idempotent=True, max_retries=5, base=1.0, cap=30.0, max_total_delay=15.0):
+    """
+    Calls fn() (returning a urllib3 response) and retries transient failures.
+    Idempotent calls are retried on connection errors/timeouts, HTTP 429 and 5xx,
+    and retryable Slack errors. Non-idempotent calls (posting a message) are only
+    retried when the request cannot have been applied: connect errors, 429 with
+    Retry-After, and the Slack errors in _NOT_APPLIED.
+    Honors Retry-After on 429, otherwise backs off exponentially with jitter; gives
+    up once the total sleep would exceed max_total_delay seconds.
+    Returns (response, decoded JSON body); response is None if every attempt failed
+    to connect, and the body is {} if it was not JSON.
+    """
+    r, resp = None, {}
+    slept = 0.0
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            r = fn()
+        except urllib3.exceptions.HTTPError as e:
+            r, resp, reason = None, {}, str(e)
+            # Only a failed connect guarantees the request was never sent
+            if not idempotent and not isinstance(e, urllib3.exceptions.ConnectTimeoutError):
+                logging.warning("Slack API call failed (%s), not retrying", reason)
+                break
+        else:
+            try:
+                resp = json.loads(r.data.decode('utf-8'))
+            except ValueError:
+                resp = {}
+            error = resp.get('error')
+            if (r.status == 200 and resp.get('ok')) or error in _FAIL_FAST:
+                return r, resp
+            if r.status == 429:
+                retry_after = r.headers.get('Retry-After')
+            if idempotent:
+                retryable = r.status == 429 or r.status >= 500 or error in _RETRYABLE
+            else:
+                retryable = (r.status == 429 and retry_after is not None) or error in _NOT_APPLIED
+            if not retryable:
+                return r, resp
+            reason = error or f"HTTP {r.status}"
+
+        if attempt == max_retries:
+            break
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(cap, base * 2 ** attempt) * (1 + random.random() * 0.5)
+        if slept + delay > max_total_delay:
+            logging.warning("Slack API call failed (%s), retry budget of %.0fs exhausted",
+                            reason, max_total_delay)
+            break
+        logging.warning("Slack API call failed (%s), retrying in %.1fs (attempt %d/%d)",
+                        reason, delay, attempt + 1, max_retries)
+        time.sleep(delay)
+        slept += delay
+
+    return r, resp
+
+
+# Line separators in budget alert messages
+_LINE_SEP_RE = re.compile(r'\|\|\||\n')
+
+
+# Currency symbols and thousands separators dropped from amounts
+_AMOUNT_STRIP = str.maketrans('', '', '$,')
+
+
+# Static trailer of every budget message
+_SUGGESTED_ACTIONS = ("Here's what you can do:\n"
+                      "1️⃣ Review and adjust your resources to manage costs.\n"
+                      "2️⃣ Consider adjusting your budget settings if necessary.\n\n")
+_COST_EXPLORER_LINK = "https://us-east-1.console.aws.amazon.com/cost-management/home#/cost-explorer"
+_COST_LINK_LINE = f"\nYou can view your cost and usage report in <{_COST_EXPLORER_LINK}|Cost Explorer>.\n"
+
+
 def get_slack_token():
     # Retrieve Slack token from environment variable
     return os.environ.get('SLACK_TOKEN') if not None else None
@@ -10,63 +109,130 @@ def get_slack_token():
 def extract_budget_details(message):
     budget_details = {}
     
-    # Replace \\n with a unique delimiter
-    message = message.replace('\\n', '|||')
-    
-    lines = message.split('|||')
-    
-    for line in lines:
-        parts = line.split('\n')
-        for part in parts:
-            key_value = part.split(': ')
-            if len(key_value) == 2:
-                key = key_value[0].strip()
-                value = key_value[1].strip()
-                budget_details[key] = value
+    # Lines are separated by a literal "\\n", "|||" or a newline; a line
+    # holding exactly one ': ' is a key/value pair
+    for line in _LINE_SEP_RE.split(message.replace('\\n', '|||')):
+        key, sep, value = line.partition(': ')
+        if sep and ': ' not in value:
+            budget_details[key.strip()] = value.strip()
                 
     logging.info("Extracted budget details: %s", budget_details)
     return budget_details
 
 
+# users.lookupByEmail results per normalized email: email -> (expiry time, user ID or None).
+# Found users are kept for _CACHE_TTL seconds; emails Slack reports as
+# users_not_found are remembered (as None) for _NEG_TTL seconds.
+_CACHE_TTL = 1800
+_NEG_TTL = 86400
+_email_cache = {}
+_email_cache_lock = threading.Lock()
+
+
 def get_user_by_email(email):
     # Implement the logic to retrieve user ID based on email
     # Return None if user is not found
+    # Found users and definite misses are cached per normalized email
+    key = normalize_email(email)
+    if key is None:
+        logging.warning("Not a valid email address: %r", email)
+        return None
+    email = key
+    with _email_cache_lock:
+        cached = _email_cache.get(key)
+    if cached is not None and time.time() < cached[0]:
+        if cached[1] is None:
+            logging.debug("slack lookup negative-cache hit for %s", email)
+        return cached[1]
+
+    user_id, error = _lookup_user_by_email(email)
+    # Transient failures (timeouts, 5xx after retries) are not cached
+    if user_id is not None:
+        ttl = _CACHE_TTL
+    elif error == 'users_not_found':
+        ttl = _NEG_TTL
+    else:
+        return None
+    with _email_cache_lock:
+        _email_cache[key] = (time.time() + ttl, user_id)
+    return user_id
+
+
+def _lookup_user_by_email(email):
+    # Returns (user ID, None) on success, or (None, Slack error) otherwise
     slack_token = get_slack_token()
     api = 'https://slack.com/api/'
 
-    http = urllib3.PoolManager()
     request_url = api + 'users.lookupByEmail?email=' + email
-    r = http.request('GET', request_url, headers={"Authorization": "Bearer " + slack_token})
-    resp = json.loads(r.data.decode('utf-8'))
-    print(resp)
-    if not resp['ok']:
+    r, resp = _with_retry(lambda: _HTTP.request('GET', request_url, headers={"Authorization": "Bearer " + slack_token}))
+    logging.debug("users.lookupByEmail: ok=%s error=%s", resp.get('ok'), resp.get('error'))
+    if not resp.get('ok'):
         # can't find user id, return None
-        return None
-    return resp['user']['id']
+        return None, resp.get('error')
+    return resp['user']['id'], None
     
-def send_slack_message(channel, message="", json_blocks=None):
-    # Implement the logic to send a Slack message
-    # This function remains unchanged from your original code
+def build_email_to_user_id_map():
+    """
+    Fetches all workspace members via users.list (paged) and returns a dict
+    of normalize_email(email) -> user ID. Returns an empty dict if the listing fails.
+    """
+    slack_token = get_slack_token()
+    api = 'https://slack.com/api/'
+
+    email_map = {}
+    cursor = ''
+    while True:
+        r, resp = _with_retry(lambda: _HTTP.request('GET', api + 'users.list', fields={'limit': 200, 'cursor': cursor},
+                                                    headers={"Authorization": "Bearer " + slack_token}))
+        if not resp.get('ok'):
+            logging.warning("users.list failed: %s", resp.get('error'))
+            return {}
+        for member in resp.get('members', []):
+            email = member.get('profile', {}).get('email')
+            key = normalize_email(email)
+            if key and not member.get('deleted'):
+                # An exact address wins over a plus-addressed alias of it
+                if key == email.lower():
+                    email_map[key] = member['id']
+                else:
+                    email_map.setdefault(key, member['id'])
+        cursor = resp.get('response_metadata', {}).get('next_cursor')
+        if not cursor:
+            break
+
+    logging.info("Loaded %d Slack users with email addresses", len(email_map))
+    return email_map
+
+def send_slack_message(channel, message="", blocks=None):
+    # Post a message (optionally with Block Kit blocks) via chat.postMessage
+    # as a JSON body with Bearer auth; returns True if Slack reports ok
     slack_token = get_slack_token()
     api = 'https://slack.com/api/'
 
-    http = urllib3.PoolManager()
     data = {
-        'token': slack_token,
         'channel': channel,
-        'as_user': True,
         'text': message,
         'link_names': True
     }
-    if json_blocks is not None:
-        data['blocks'] = json.dumps(json_blocks)
+    if blocks is not None:
+        data['blocks'] = blocks
 
     request_url = api + 'chat.postMessage'
-    r = http.request('POST', request_url, fields=data)
+    body = _dumps(data)
+    # Posting is not idempotent: only retry when Slack cannot have posted the message
+    r, resp = _with_retry(lambda: _HTTP.request('POST', request_url, body=body,
+                                                headers={"Authorization": "Bearer " + slack_token,
+                                                         "Content-Type": "application/json; charset=utf-8"}),
+                          idempotent=False)
+    if r is None:
+        return False
     if r.status != 200:
         logging.info(f"Slack API returned status code {r.status}")
         logging.info(f"Response data: {r.data.decode('utf-8')}")
         return False
+    if not resp.get('ok'):
+        logging.info(f"Slack API returned error: {resp.get('error')}")
+        return False
     return True
     
 
@@ -84,15 +250,26 @@ def modify_email(email):
     # If the email doesn't contain '+', return the original email
     return email
 
+def normalize_email(email):
+    """
+    Canonical form used to match owner emails to Slack users: lower-cased, with
+    any '+tag' removed from the local part. Returns None (instead of raising)
+    if email is not of the form local@domain.
+    """
+    local_part, at, domain_part = (email or '').strip().rpartition('@')
+    local_part = local_part.split('+')[0]
+    if not at or not local_part or not domain_part or '@' in local_part:
+        return None
+    return f"{local_part}@{domain_part}".lower()
+
 def parse_amount(amount_string):
     """
     Parses the amount string and returns a float value.
     """
-    if amount_string in ['N/A', None, '']:
+    if not amount_string or amount_string == 'N/A':
         return None
-    cleaned_string = amount_string.replace('$', '').replace(',', '').strip()
     try:
-        return float(cleaned_string)
+        return float(amount_string.translate(_AMOUNT_STRIP).strip())
     except ValueError as e:
         logging.error(f"Could not convert string to float: '{amount_string}' - {str(e)}")
         return None
@@ -101,38 +278,35 @@ def format_slack_message(user_name, account_id, budget_details):
     """
     Formats a message to send on Slack based on budget and actual amounts.
     """
-    budgeted_amount = parse_amount(budget_details.get('Budgeted Amount', 'N/A'))
-    actual_amount = parse_amount(budget_details.get('ACTUAL Amount', 'N/A'))
+    budgeted = budget_details.get('Budgeted Amount', 'N/A')
+    actual = budget_details.get('ACTUAL Amount', 'N/A')
+    budgeted_amount = parse_amount(budgeted)
+    actual_amount = parse_amount(actual)
 
     # Emoji and message initialization
     frog_emoji = "\U0001F438"
     money_bag_emoji = "\U0001F4B0"
     warning_emoji = "\U000026A0\U0000FE0F"
-    message_content = f"Hey {user_name}! {frog_emoji}\n\n"
+    parts = [f"Hey {user_name}! {frog_emoji}\n\n"]
 
     if actual_amount is not None and budgeted_amount is not None:
         if actual_amount >= budgeted_amount:
             # Exceeded budget
-            message_content += (f"Uh oh! Your AWS account {account_id} budget has been exceeded! {warning_emoji}\n\n"
-                                f"{money_bag_emoji} Budgeted Amount: {budget_details.get('Budgeted Amount', 'N/A')}\n"
-                                f"{money_bag_emoji} Actual Amount: {budget_details.get('ACTUAL Amount', 'N/A')}\n\n"
-                                "Your account is at risk of being terminated unless you take action.\n\n")
+            parts.append(f"Uh oh! Your AWS account {account_id} budget has been exceeded! {warning_emoji}\n\n"
+                         f"{money_bag_emoji} Budgeted Amount: {budgeted}\n"
+                         f"{money_bag_emoji} Actual Amount: {actual}\n\n"
+                         "Your account is at risk of being terminated unless you take action.\n\n")
         else:
             # Close to exceeding or under budget
-            message_content += (f"Your AWS account {account_id} is within its budget, but keep an eye on it! {warning_emoji}\n\n"
-                                f"{money_bag_emoji} Budgeted Amount: {budget_details.get('Budgeted Amount', 'N/A')}\n"
-                                f"{money_bag_emoji} Actual Amount: {budget_details.get('ACTUAL Amount', 'N/A')}\n\n")
+            parts.append(f"Your AWS account {account_id} is within its budget, but keep an eye on it! {warning_emoji}\n\n"
+                         f"{money_bag_emoji} Budgeted Amount: {budgeted}\n"
+                         f"{money_bag_emoji} Actual Amount: {actual}\n\n")
     else:
         # Budget or actual amount not available
-        message_content += "We're having trouble determining your budget or actual spending. Please check your AWS account directly.\n\n"
-
-    # Suggested actions remain the same
-    message_content += ("Here's what you can do:\n"
-                        "1️⃣ Review and adjust your resources to manage costs.\n"
-                        "2️⃣ Consider adjusting your budget settings if necessary.\n\n")
-    # Add link to Cost Explorer
-    cost_explorer_link = "https://us-east-1.console.aws.amazon.com/cost-management/home#/cost-explorer"
-    message_content += f"\nYou can view your cost and usage report in <{cost_explorer_link}|Cost Explorer>.\n"                        
+        parts.append("We're having trouble determining your budget or actual spending. Please check your AWS account directly.\n\n")
 
-    return message_content
+    # Suggested actions and the Cost Explorer link remain the same
+    parts.append(_SUGGESTED_ACTIONS)
+    parts.append(_COST_LINK_LINE)
 
+    return "".join(parts)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Slack retry/caching policy in slack.py and for the
+expiration-check variants in demo_expiration_alerts.py.
+Slack is never contacted: slack._HTTP is replaced with a scripted fake.
+Run with: python -m unittest test_alert_logic
+"""
+
+import io
+import os
+import random
+import sys
+import time
+import unittest
+import contextlib
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import urllib3
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import slack
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import demo_expiration_alerts as demo
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b'{"ok": true}', headers=None):
+        self.status = status
+        self.data = body
+        self.headers = headers or {}
+
+
+class FakeHTTP:
+    """Stands in for slack._HTTP: each request pops the next scripted outcome."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _read_timeout():
+    return urllib3.exceptions.ReadTimeoutError(None, "https://slack.com/api/chat.postMessage", "Read timed out.")
+
+
+def _connect_error():
+    return urllib3.exceptions.NewConnectionError(None, "Failed to establish a new connection")
+
+
+class SlackTestCase(unittest.TestCase):
+    def setUp(self):
+        os.environ["SLACK_TOKEN"] = "xoxb-test"
+        slack._email_cache.clear()
+        self.sleeps = []
+        patches = [
+            mock.patch.object(slack.time, "sleep", side_effect=self.sleeps.append),
+            # No jitter, so backoff delays are exactly base * 2 ** attempt
+            mock.patch.object(slack.random, "random", return_value=0.0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def use(self, *outcomes):
+        fake = FakeHTTP(*outcomes)
+        patch = mock.patch.object(slack, "_HTTP", fake)
+        patch.start()
+        self.addCleanup(patch.stop)
+        return fake
+
+
+class RetryPolicyTests(SlackTestCase):
+    def test_post_read_timeout_is_not_retried(self):
+        fake = self.use(_read_timeout(), FakeResponse())
+        self.assertFalse(slack.send_slack_message("C1", "hello"))
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_post_5xx_is_not_retried(self):
+        fake = self.use(FakeResponse(500, b"oops"), FakeResponse())
+        self.assertFalse(slack.send_slack_message("C1", "hello"))
+        self.assertEqual(len(fake.calls), 1)
+
+    def test_post_connect_error_is_retried(self):
+        fake = self.use(_connect_error(), FakeResponse())
+        self.assertTrue(slack.send_slack_message("C1", "hello"))
+        self.assertEqual(len(fake.calls), 2)
+        self.assertEqual(self.sleeps, [1.0])
+
+    def test_post_429_honors_retry_after(self):
+        rate_limited = FakeResponse(429, b'{"ok": false, "error": "ratelimited"}', {"Retry-After": "2"})
+        fake = self.use(rate_limited, FakeResponse())
+        self.assertTrue(slack.send_slack_message("C1", "hello"))
+        self.assertEqual(len(fake.calls), 2)
+        self.assertEqual(self.sleeps, [2.0])
+
+    def test_get_5xx_retried_until_max_total_delay(self):
+        fake = self.use(FakeResponse(503, b"unavailable"))
+        self.assertEqual(slack.build_email_to_user_id_map(), {})
+        # Backoff 1 + 2 + 4 + 8 = 15s fits the 15s budget; the next 16s delay does not
+        self.assertEqual(self.sleeps, [1.0, 2.0, 4.0, 8.0])
+        self.assertLessEqual(sum(self.sleeps), 15.0)
+        self.assertEqual(len(fake.calls), len(self.sleeps) + 1)
+
+
+class EmailCacheTests(SlackTestCase):
+    def test_users_not_found_cached_for_a_day(self):
+        fake = self.use(FakeResponse(200, b'{"ok": false, "error": "users_not_found"}'))
+        self.assertIsNone(slack.get_user_by_email("Nobody+tag@Example.com"))
+        self.assertIsNone(slack.get_user_by_email("nobody@example.com"))
+        self.assertEqual(len(fake.calls), 1)
+        expires, user_id = slack._email_cache["nobody@example.com"]
+        self.assertIsNone(user_id)
+        self.assertAlmostEqual(expires - time.time(), slack._NEG_TTL, delta=5)
+
+    def test_transient_failure_not_cached(self):
+        fake = self.use(FakeResponse(200, b'{"ok": false, "error": "internal_error"}'))
+        self.assertIsNone(slack.get_user_by_email("owner@example.com"))
+        self.assertNotIn("owner@example.com", slack._email_cache)
+        calls = len(fake.calls)
+        self.assertIsNone(slack.get_user_by_email("owner@example.com"))
+        self.assertGreater(len(fake.calls), calls)
+
+    def test_found_user_cached(self):
+        fake = self.use(FakeResponse(200, b'{"ok": true, "user": {"id": "U1"}}'))
+        self.assertEqual(slack.get_user_by_email("owner@example.com"), "U1")
+        self.assertEqual(slack.get_user_by_email("OWNER@example.com"), "U1")
+        self.assertEqual(len(fake.calls), 1)
+
+    def test_unparseable_email_is_not_found(self):
+        fake = self.use(FakeResponse())
+        self.assertIsNone(slack.get_user_by_email("a+b"))
+        self.assertEqual(fake.calls, [])
+
+
+_COLUMNS = ("name", "projectName", "user", "catalogName", "environmentType", "resourceGroupId")
+_UTC_FORMATS = ('%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%S+00:00', '%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+
+def _column_store(expirations):
+    envs = {column: [f"{column}-{i}" for i in range(len(expirations))] for column in _COLUMNS}
+    envs["expirationDate"] = expirations
+    return envs
+
+
+def _random_expirations(rng, now, count):
+    """UTC-normalized ISO strings clustered around now and the 3-day threshold, some missing."""
+    expirations = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            expirations.append(None)
+            continue
+        anchor = rng.choice([now, now + timedelta(days=3), now + timedelta(days=rng.uniform(-10, 10))])
+        moment = anchor + timedelta(microseconds=rng.randint(-2_000_000, 2_000_000))
+        expirations.append(moment.astimezone(timezone.utc).strftime(rng.choice(_UTC_FORMATS)))
+    return expirations
+
+
+class ExpirationCheckEquivalenceTests(unittest.TestCase):
+    now = datetime(2026, 10, 14, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+    def check(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return demo.check_expiring_environments(*args, now=self.now, limit=1000, **kwargs)
+
+    def test_sorted_and_np_match_linear(self):
+        rng = random.Random(1234)
+        for _ in range(500):
+            envs = _column_store(_random_expirations(rng, self.now, rng.randint(0, 12)))
+            expected, total, expired = self.check(envs)
+            with contextlib.redirect_stdout(io.StringIO()):
+                np_result = demo.check_expiring_environments_np(envs, now=self.now, limit=1000)
+                sorted_result = demo.check_expiring_environments_sorted(
+                    demo.sort_by_expiration(envs), now=self.now, limit=1000)
+            self.assertEqual(np_result, (expected, total, expired))
+            # The sorted variant lists the same rows, in expiration order
+            self.assertEqual(sorted_result[1:], (total, expired))
+            self.assertCountEqual([env["name"] for env in sorted_result[0]], [env["name"] for env in expected])
+
+    def test_fractional_seconds_at_threshold(self):
+        envs = _column_store(['2026-10-14T12:00:00Z', '2026-10-17T12:00:00.900000Z'])
+        self.assertEqual(self.check(envs)[1:], (1, 1))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(demo.check_expiring_environments_np(envs, now=self.now)[1:], (1, 1))
+
+    def test_np_ignores_values_the_scalar_gate_rejects(self):
+        envs = _column_store(['2026-10', 'garbage', '2026-13-01T00:00:00Z'])
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(demo.check_expiring_environments_np(envs, now=self.now), ([], 0, 0))
+        self.assertEqual(self.check(envs), ([], 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
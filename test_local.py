@@ -14,12 +14,18 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Load environment variables from local.settings.json
 import json
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = lambda b: json.loads(b.decode('utf-8'))
+
 local_settings_path = os.path.join(os.path.dirname(__file__), '..', 'local.settings.json')
 if os.path.exists(local_settings_path):
-    with open(local_settings_path, 'r') as f:
-        settings = json.load(f)
-        for key, value in settings.get('Values', {}).items():
-            os.environ[key] = value
+    with open(local_settings_path, 'rb') as f:
+        settings = _loads(f.read())
+    # Variables already set in the shell take precedence
+    os.environ |= {key: value for key, value in settings.get('Values', {}).items() if key not in os.environ}
     print(f"✅ Loaded environment variables from local.settings.json")
 else:
     print("⚠️  No local.settings.json found, using system environment variables")
@@ -19,7 +19,8 @@ def validate_syntax(filepath):
         app_found = False
         functions_found = []
         
-        for node in ast.walk(tree):
+        # The app instance and decorated functions only live at module level
+        for node in tree.body:
             # Look for: app = func.FunctionApp()
             if isinstance(node, ast.Assign):
                 for target in node.targets: